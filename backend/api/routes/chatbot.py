@@ -2,6 +2,7 @@
 Chatbot API routes
 """
 from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 from api.routes.auth import verify_token
@@ -31,29 +32,7 @@ async def chat(
     Send a message to the AI chatbot and get a response
     """
     try:
-        # Get current user from token
-        if not authorization:
-            raise HTTPException(status_code=401, detail="Authorization header required")
-        
-        token = authorization.replace("Bearer ", "")
-        
-        # Verify JWT token
-        try:
-            token_data = await verify_token(token)
-            user_id = token_data.get("user_id")
-        except Exception as e:
-            raise HTTPException(status_code=401, detail="Invalid or expired token")
-        
-        if not user_id:
-            raise HTTPException(status_code=401, detail="Token missing user_id")
-        
-        # Convert messages to dict format
-        messages = [{"role": msg.role, "content": msg.content} for msg in request.messages]
-        
-        # Get user context if requested
-        user_context = None
-        if request.include_context and user_id:
-            user_context = await _get_user_context(str(user_id))
+        messages, user_context = await _prepare_chat(request, authorization)
         
         # Get AI response
         response = await chatbot_service.chat(messages, user_context)
@@ -63,6 +42,55 @@ async def chat(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/chat/stream")
+async def chat_stream(
+    request: ChatRequest,
+    authorization: str = Header(None)
+):
+    """
+    Send a message to the AI chatbot and stream the response as plain text while it is generated
+    """
+    try:
+        messages, user_context = await _prepare_chat(request, authorization)
+        
+        # Open the Groq stream before responding so failures still return an error status
+        chunks = await chatbot_service.chat_stream(messages, user_context)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return StreamingResponse(chunks, media_type="text/plain; charset=utf-8")
+
+async def _prepare_chat(request: ChatRequest, authorization: str):
+    """Authenticate the caller and build the message list and user context for a chat request"""
+    # Get current user from token
+    if not authorization:
+        raise HTTPException(status_code=401, detail="Authorization header required")
+    
+    token = authorization.replace("Bearer ", "")
+    
+    # Verify JWT token
+    try:
+        token_data = await verify_token(token)
+        user_id = token_data.get("user_id")
+    except Exception as e:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Token missing user_id")
+    
+    # Convert messages to dict format
+    messages = [{"role": msg.role, "content": msg.content} for msg in request.messages]
+    
+    # Get user context if requested
+    user_context = None
+    if request.include_context and user_id:
+        user_context = await _get_user_context(str(user_id))
+    
+    return messages, user_context
+
 async def _get_user_context(user_id: str) -> Dict:
     """Get user context for personalized responses"""
     try:
@@ -5,7 +5,7 @@ from bson import ObjectId
 from datetime import datetime
 from database.connection import get_collection
 import logging
-import json
+import orjson
 import re
 
 router = APIRouter()
@@ -58,7 +58,7 @@ Respond with only valid JSON array."""
             
             response_text = message.content[0].text
             json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
-            projects_data = json.loads(json_match.group() if json_match else response_text)
+            projects_data = orjson.loads(json_match.group() if json_match else response_text)
             
         except:
             # Fallback: return hardcoded projects
@@ -0,0 +1,67 @@
+"""
+Curated Fallback Resources
+Known-good learning resources keyed by lowercase skill keyword, used when a generated resource is unavailable
+"""
+
+CURATED_FALLBACKS = {
+    "python": [
+        {"title": "The Python Tutorial", "url": "https://docs.python.org/3/tutorial/", "description": "Official Python tutorial covering the language from the ground up", "estimated_hours": 5, "resource_type": "documentation"},
+    ],
+    "javascript": [
+        {"title": "MDN JavaScript Guide", "url": "https://developer.mozilla.org/en-US/docs/Web/JavaScript/Guide", "description": "Comprehensive JavaScript guide from MDN Web Docs", "estimated_hours": 6, "resource_type": "documentation"},
+    ],
+    "typescript": [
+        {"title": "The TypeScript Handbook", "url": "https://www.typescriptlang.org/docs/handbook/intro.html", "description": "Official TypeScript handbook", "estimated_hours": 5, "resource_type": "documentation"},
+    ],
+    "react": [
+        {"title": "Learn React", "url": "https://react.dev/learn", "description": "Official interactive React tutorial", "estimated_hours": 6, "resource_type": "documentation"},
+    ],
+    "node": [
+        {"title": "Introduction to Node.js", "url": "https://nodejs.org/en/learn/getting-started/introduction-to-nodejs", "description": "Official Node.js learning path", "estimated_hours": 4, "resource_type": "documentation"},
+    ],
+    "html": [
+        {"title": "MDN Learn HTML", "url": "https://developer.mozilla.org/en-US/docs/Learn/HTML", "description": "Structuring content on the web with HTML", "estimated_hours": 4, "resource_type": "article"},
+    ],
+    "css": [
+        {"title": "MDN Learn CSS", "url": "https://developer.mozilla.org/en-US/docs/Learn/CSS", "description": "Styling web pages with CSS", "estimated_hours": 5, "resource_type": "article"},
+    ],
+    "sql": [
+        {"title": "SQLBolt", "url": "https://sqlbolt.com/", "description": "Interactive SQL lessons and exercises", "estimated_hours": 4, "resource_type": "practice"},
+    ],
+    "git": [
+        {"title": "Pro Git Book", "url": "https://git-scm.com/book/en/v2", "description": "Free official book on Git", "estimated_hours": 6, "resource_type": "documentation"},
+    ],
+    "docker": [
+        {"title": "Docker Get Started", "url": "https://docs.docker.com/get-started/", "description": "Official Docker getting started guide", "estimated_hours": 3, "resource_type": "documentation"},
+    ],
+    "kubernetes": [
+        {"title": "Learn Kubernetes Basics", "url": "https://kubernetes.io/docs/tutorials/kubernetes-basics/", "description": "Official Kubernetes basics tutorial", "estimated_hours": 4, "resource_type": "documentation"},
+    ],
+    "java": [
+        {"title": "Learn Java", "url": "https://dev.java/learn/", "description": "Official Java learning path", "estimated_hours": 8, "resource_type": "documentation"},
+    ],
+    "django": [
+        {"title": "Writing your first Django app", "url": "https://docs.djangoproject.com/en/stable/intro/tutorial01/", "description": "Official Django tutorial", "estimated_hours": 5, "resource_type": "documentation"},
+    ],
+    "flask": [
+        {"title": "Flask Tutorial", "url": "https://flask.palletsprojects.com/en/stable/tutorial/", "description": "Official Flask tutorial building a small blog app", "estimated_hours": 4, "resource_type": "documentation"},
+    ],
+    "fastapi": [
+        {"title": "FastAPI Tutorial - User Guide", "url": "https://fastapi.tiangolo.com/tutorial/", "description": "Official step-by-step FastAPI guide", "estimated_hours": 5, "resource_type": "documentation"},
+    ],
+    "vue": [
+        {"title": "Vue.js Tutorial", "url": "https://vuejs.org/tutorial/", "description": "Official interactive Vue tutorial", "estimated_hours": 4, "resource_type": "documentation"},
+    ],
+    "angular": [
+        {"title": "Angular Tutorials", "url": "https://angular.dev/tutorials", "description": "Official Angular tutorials", "estimated_hours": 5, "resource_type": "documentation"},
+    ],
+    "mongodb": [
+        {"title": "MongoDB University", "url": "https://learn.mongodb.com/", "description": "Free official MongoDB courses", "estimated_hours": 6, "resource_type": "course"},
+    ],
+    "rust": [
+        {"title": "The Rust Programming Language", "url": "https://doc.rust-lang.org/book/", "description": "The official Rust book", "estimated_hours": 10, "resource_type": "documentation"},
+    ],
+    "linux": [
+        {"title": "Linux Journey", "url": "https://linuxjourney.com/", "description": "Free guided introduction to Linux", "estimated_hours": 5, "resource_type": "article"},
+    ],
+}
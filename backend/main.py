@@ -14,6 +14,7 @@ from api.middleware import (
     general_exception_handler
 )
 from database.connection import connect_to_mongo, close_mongo_connection
+from services.http_client import close_http_clients
 
 # Load environment variables
 load_dotenv()
@@ -25,6 +26,7 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     await close_mongo_connection()
+    await close_http_clients()
 
 app = FastAPI(
     title="PathForge API",
@@ -27,9 +27,7 @@ ADMIN_USER = {
     "profile_completed": True,
     "has_resume": False,
     "current_skills": [],
-    "target_roles": [],
-    "created_at": datetime.utcnow(),
-    "updated_at": datetime.utcnow()
+    "target_roles": []
 }
 
 async def seed_roadmap_templates():
@@ -41,25 +39,30 @@ async def seed_roadmap_templates():
         
         print("🌱 Starting roadmap templates seeding...")
         
+        # One timestamp for the whole seeding batch
+        now = datetime.utcnow()
+        
         # Ensure admin user exists
         users_collection = db["users"]
         admin = await users_collection.find_one({"uid": ADMIN_USER["uid"]})
         
         if not admin:
-            await users_collection.insert_one(ADMIN_USER)
+            await users_collection.insert_one({**ADMIN_USER, "created_at": now, "updated_at": now})
             print("✓ Created template admin user")
         
         # Seed roadmap templates
         roadmaps_collection = db["roadmaps"]
         
+        # Look up which templates already exist in a single query
+        titles = [template["title"] for template in ROADMAP_TEMPLATES]
+        existing_docs = await roadmaps_collection.find(
+            {"is_template": True, "title": {"$in": titles}},
+            {"title": 1, "_id": 0}
+        ).to_list(length=len(titles))
+        existing_titles = {doc["title"] for doc in existing_docs}
+        
         for template in ROADMAP_TEMPLATES:
-            # Check if template already exists
-            existing = await roadmaps_collection.find_one({
-                "title": template["title"],
-                "is_template": True
-            })
-            
-            if existing:
+            if template["title"] in existing_titles:
                 print(f"⊘ Template '{template['title']}' already exists")
                 continue
             
@@ -76,39 +79,34 @@ async def seed_roadmap_templates():
                 "is_deleted": False,
                 "progress_percentage": 0,
                 "current_module_index": 0,
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow(),
-                "modules": []
-            }
-            
-            # Process modules
-            for module_data in template["modules"]:
-                module = {
-                    "id": f"mod_{len(roadmap_doc['modules']) + 1}",
-                    "title": module_data["title"],
-                    "description": module_data["description"],
-                    "order": module_data["order"],
-                    "completed": False,
-                    "resources": []
-                }
-                
-                # Process resources
-                for res_data in module_data["resources"]:
-                    resource = {
-                        "id": f"res_{len(module['resources']) + 1}",
-                        "title": res_data["title"],
-                        "type": res_data["type"],
-                        "url": res_data["url"],
-                        "status": "not_started",
-                        "rating": 0,
-                        "time_spent_seconds": 0,
-                        "estimated_minutes": res_data["estimated_minutes"],
+                "created_at": now,
+                "updated_at": now,
+                "modules": [
+                    {
+                        "id": f"mod_{module_index}",
+                        "title": module_data["title"],
+                        "description": module_data["description"],
+                        "order": module_data["order"],
                         "completed": False,
-                        "notes": ""
+                        "resources": [
+                            {
+                                "id": f"res_{resource_index}",
+                                "title": res_data["title"],
+                                "type": res_data["type"],
+                                "url": res_data["url"],
+                                "status": "not_started",
+                                "rating": 0,
+                                "time_spent_seconds": 0,
+                                "estimated_minutes": res_data["estimated_minutes"],
+                                "completed": False,
+                                "notes": ""
+                            }
+                            for resource_index, res_data in enumerate(module_data["resources"], start=1)
+                        ]
                     }
-                    module["resources"].append(resource)
-                
-                roadmap_doc["modules"].append(module)
+                    for module_index, module_data in enumerate(template["modules"], start=1)
+                ]
+            }
             
             # Insert template
             result = await roadmaps_collection.insert_one(roadmap_doc)
@@ -1,47 +1,185 @@
-from groq import Groq
+from groq import AsyncGroq
 import os
-import json
+import orjson
+import asyncio
+import re
 from typing import List, Dict
 from dotenv import load_dotenv
 from services.youtube_validator import YouTubeValidator
+from services.http_client import groq_http_client
+from data.curated_resources import CURATED_FALLBACKS
 
 load_dotenv()
 
+# Caps concurrent Groq requests across the process to avoid 429 storms under load;
+# the Groq client already retries rate-limited requests with exponential backoff
+_GROQ_SEM = asyncio.Semaphore(int(os.getenv("GROQ_MAX_CONCURRENCY", "8")))
+
+# Prompt guidance per roadmap difficulty level
+DIFFICULTY_GUIDANCE = {
+    "beginner": "Focus on fundamentals and step-by-step tutorials. Include more introductory content, basic concepts, and foundational knowledge. Use beginner-friendly resources with detailed explanations. Start with absolute basics.",
+    "intermediate": "Balance between theory and practice. Include intermediate tutorials and hands-on projects. Assume basic programming knowledge. Cover standard industry practices and common patterns.",
+    "advanced": "Focus on advanced concepts, best practices, and complex projects. Include deep-dive content, architecture patterns, production-ready implementations, and cutting-edge techniques. Assume strong foundation."
+}
+
+# (max deadline weeks, number of modules, module duration)
+# Aim for roughly 2-4 weeks per module depending on duration
+_MODULE_PLANS = (
+    (4, "2-3", "1-2 weeks"),
+    (8, "3-4", "2 weeks"),
+    (12, "4-6", "2-3 weeks"),
+    (16, "6-8", "2-3 weeks"),
+)
+_LONG_MODULE_PLAN = ("8-12", "2-3 weeks")  # 24+ weeks
+
+
+def _module_plan(deadline_weeks: int) -> tuple:
+    """Return (num_modules, module_duration) for a roadmap deadline"""
+    for max_weeks, num_modules, module_duration in _MODULE_PLANS:
+        if deadline_weeks <= max_weeks:
+            return num_modules, module_duration
+    return _LONG_MODULE_PLAN
+
+
+_ROADMAP_PROMPT_TEMPLATE = """
+        Create a detailed learning roadmap for someone targeting: {target_role}
+        
+        PARAMETERS:
+        - Skills to learn: {skills}
+        - Total Duration: {deadline_weeks} WEEKS
+        - Study Time: {available_hours_per_week} hours/week (Total: {total_hours} hours)
+        - Difficulty Level: {difficulty_label}
+        
+        DIFFICULTY LEVEL REQUIREMENTS ({difficulty_label}):
+        {guidance}
+        
+        Generate a structured learning plan with modules and resources.
+        Return ONLY a JSON object:
+        {{
+            "modules": [
+                {{
+                    "title": "Module name",
+                    "description": "What student will learn",
+                    "skills_covered": ["skill1", "skill2"],
+                    "estimated_hours": <number>,
+                    "order": <number>,
+                    "resources": [
+                        {{
+                            "title": "Resource name",
+                            "url": "https://example.com/resource",
+                            "description": "Brief description",
+                            "estimated_hours": <number>,
+                            "resource_type": "video|article|course|practice",
+                            "order": <number>
+                        }}
+                    ]
+                }}
+            ]
+        }}
+        
+        CRITICAL REQUIREMENTS:
+        - Create EXACTLY {num_modules} modules to cover {deadline_weeks} weeks (each module ~{module_duration})
+        - Distribute the {total_hours} total hours across ALL modules evenly
+        - Each module should have 3-5 high-quality resources appropriate for {difficulty_level} level
+        
+        RESOURCE URL REQUIREMENTS (IN ORDER OF PRIORITY):
+        1. **YouTube Videos (PREFERRED)**: Use real YouTube video URLs whenever possible
+           - Format: https://www.youtube.com/watch?v=VIDEO_ID
+           - Popular channels: freeCodeCamp.org, Traversy Media, Fireship, Programming with Mosh, The Net Ninja, Corey Schafer, Academind, Kevin Powell, Web Dev Simplified
+           - Use recent videos (2023-2025) from these verified channels
+           - Example: "https://www.youtube.com/watch?v=rfscVS0vtbw" (Python Full Course)
+           
+        2. **Interactive Coding Platforms**: 
+           - freeCodeCamp.org, Codecademy, Scrimba, CodePen, CodeSandbox
+           - These embed well and are interactive
+           
+        3. **Documentation & Articles (use sparingly)**:
+           - Official docs: React docs, Python docs, MDN Web Docs
+           - Only use when video tutorials don't exist
+        
+        - Prioritize 70% YouTube videos, 20% interactive platforms, 10% documentation
+        - Each resource MUST have a valid, specific URL (no placeholders or search URLs)
+        - Use actual YouTube video URLs, not search results
+        - Total hours should not exceed {total_hours}
+        - Order modules logically: basics → intermediate → advanced → practical projects
+        - Include at least one hands-on project or practice exercise per module
+        """
+
+
+# Resume characters sent for skill extraction (roughly 3K tokens)
+RESUME_CHAR_BUDGET = 12000
+
+# Stable instructions for resume extraction; the resume itself is sent as the user message
+SYSTEM_EXTRACT_PROMPT = """Analyze the resume provided by the user and extract structured information.
+
+Extract and return ONLY a JSON object with the following structure:
+{
+    "skills": ["skill1", "skill2", ...],
+    "experience_years": <number>,
+    "education": "highest degree",
+    "job_titles": ["title1", "title2", ...]
+}
+
+Focus on technical skills, frameworks, programming languages, and tools."""
+
+# Static parts of the fallbacks returned when the LLM call fails
+_SKILL_GAP_FALLBACK_ENTRY = {
+    "current_level": "None",
+    "required_level": "Intermediate",
+    "gap_severity": "Medium",
+    "learning_priority": "Medium"
+}
+_SKILL_GAP_FALLBACK_RECS = (
+    "Focus on foundational skills first",
+    "Practice with hands-on projects",
+    "Join online communities for support"
+)
+_ROADMAP_FALLBACK_RESOURCE = {
+    "title": "Getting Started Guide",
+    "url": "https://www.example.com",
+    "description": "Beginner-friendly introduction",
+    "estimated_hours": 10,
+    "resource_type": "course",
+    "order": 0
+}
+
+# Resource URLs that go through YouTube availability validation
+_YT_RE = re.compile(r'^(?:https?://)?(?:[\w-]+\.)?(?:youtube\.com|youtu\.be)/')
+
+# Splits resource titles into words for curated fallback lookup
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+
 class AIService:
     """Service to interact with Groq API for skill extraction and roadmap generation"""
     
     def __init__(self):
-        self.client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+        self.client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"), http_client=groq_http_client)
         self.model = "llama-3.3-70b-versatile"
     
+    async def _complete(self, prompt: str, temperature: float, json_mode: bool = False, system: str = None) -> str:
+        """Run a chat completion on the async Groq client and return the message content"""
+        kwargs = {"response_format": {"type": "json_object"}} if json_mode else {}
+        messages = [{"role": "user", "content": prompt}]
+        if system:
+            messages.insert(0, {"role": "system", "content": system})
+        async with _GROQ_SEM:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                **kwargs
+            )
+        return response.choices[0].message.content
+    
     async def extract_skills_from_resume(self, resume_text: str) -> Dict:
         """Extract skills and experience from resume text using AI"""
-        prompt = f"""
-        Analyze the following resume and extract structured information.
-        
-        Resume Text:
-        {resume_text}
-        
-        Extract and return ONLY a JSON object with the following structure:
-        {{
-            "skills": ["skill1", "skill2", ...],
-            "experience_years": <number>,
-            "education": "highest degree",
-            "job_titles": ["title1", "title2", ...]
-        }}
-        
-        Focus on technical skills, frameworks, programming languages, and tools.
-        """
+        # Keep long resumes within the model's context budget
+        resume_text = resume_text[:RESUME_CHAR_BUDGET]
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.3,
-                response_format={"type": "json_object"}
-            )
-            
-            result = json.loads(response.choices[0].message.content)
+            content = await self._complete(resume_text, temperature=0.3, json_mode=True, system=SYSTEM_EXTRACT_PROMPT)
+            result = orjson.loads(content)
             return result
         except Exception:
             return {
@@ -90,37 +228,22 @@ class AIService:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.3,
-                response_format={"type": "json_object"}
-            )
-            
-            result = json.loads(response.choices[0].message.content)
+            content = await self._complete(prompt, temperature=0.3, json_mode=True)
+            result = orjson.loads(content)
             return result
         except Exception:
             # Return structured fallback data
-            missing_skills = list(set(required_skills) - set(current_skills))
+            # Compare case-insensitively but keep the required skill's display name
+            current = frozenset(skill.strip().lower() for skill in current_skills)
+            required = {skill.strip().lower(): skill for skill in required_skills}
+            missing_skills = [name for key, name in required.items() if key not in current]
+            matching_skills = [name for key, name in required.items() if key in current]
             fallback = {
-                "skill_gaps": [
-                    {
-                        "skill": skill,
-                        "current_level": "None",
-                        "required_level": "Intermediate",
-                        "gap_severity": "Medium",
-                        "learning_priority": "Medium"
-                    }
-                    for skill in missing_skills
-                ],
-                "matching_skills": list(set(required_skills) & set(current_skills)),
+                "skill_gaps": [{"skill": skill, **_SKILL_GAP_FALLBACK_ENTRY} for skill in missing_skills],
+                "matching_skills": matching_skills,
                 "match_percentage": 0,
-                "priority_skills": missing_skills[:3] if len(missing_skills) >= 3 else missing_skills,
-                "recommendations": [
-                    "Focus on foundational skills first",
-                    "Practice with hands-on projects",
-                    "Join online communities for support"
-                ]
+                "priority_skills": missing_skills[:3],
+                "recommendations": list(_SKILL_GAP_FALLBACK_RECS)
             }
             return fallback
     
@@ -141,112 +264,29 @@ class AIService:
             
         total_hours = available_hours_per_week * deadline_weeks
         
-        # Extract skill names from skill gap objects
-        if skill_gaps and isinstance(skill_gaps[0], dict):
-            skill_names = [gap['skill'] for gap in skill_gaps]
-        else:
-            skill_names = skill_gaps
-        
-        # Calculate appropriate number of modules based on duration
-        # Aim for roughly 2-4 weeks per module depending on duration
-        if deadline_weeks <= 4:
-            num_modules = "2-3"
-            module_duration = "1-2 weeks"
-        elif deadline_weeks <= 8:
-            num_modules = "3-4"
-            module_duration = "2 weeks"
-        elif deadline_weeks <= 12:
-            num_modules = "4-6"
-            module_duration = "2-3 weeks"
-        elif deadline_weeks <= 16:
-            num_modules = "6-8"
-            module_duration = "2-3 weeks"
-        else:  # 24+ weeks
-            num_modules = "8-12"
-            module_duration = "2-3 weeks"
-        
-        # Adjust guidance based on difficulty level
-        difficulty_guidance = {
-            "beginner": "Focus on fundamentals and step-by-step tutorials. Include more introductory content, basic concepts, and foundational knowledge. Use beginner-friendly resources with detailed explanations. Start with absolute basics.",
-            "intermediate": "Balance between theory and practice. Include intermediate tutorials and hands-on projects. Assume basic programming knowledge. Cover standard industry practices and common patterns.",
-            "advanced": "Focus on advanced concepts, best practices, and complex projects. Include deep-dive content, architecture patterns, production-ready implementations, and cutting-edge techniques. Assume strong foundation."
-        }
-        
-        guidance = difficulty_guidance.get(difficulty_level, difficulty_guidance["intermediate"])
-        
-        prompt = f"""
-        Create a detailed learning roadmap for someone targeting: {target_role}
-        
-        PARAMETERS:
-        - Skills to learn: {', '.join(skill_names)}
-        - Total Duration: {deadline_weeks} WEEKS
-        - Study Time: {available_hours_per_week} hours/week (Total: {total_hours} hours)
-        - Difficulty Level: {difficulty_level.upper()}
-        
-        DIFFICULTY LEVEL REQUIREMENTS ({difficulty_level.upper()}):
-        {guidance}
-        
-        Generate a structured learning plan with modules and resources.
-        Return ONLY a JSON object:
-        {{
-            "modules": [
-                {{
-                    "title": "Module name",
-                    "description": "What student will learn",
-                    "skills_covered": ["skill1", "skill2"],
-                    "estimated_hours": <number>,
-                    "order": <number>,
-                    "resources": [
-                        {{
-                            "title": "Resource name",
-                            "url": "https://example.com/resource",
-                            "description": "Brief description",
-                            "estimated_hours": <number>,
-                            "resource_type": "video|article|course|practice",
-                            "order": <number>
-                        }}
-                    ]
-                }}
-            ]
-        }}
-        
-        CRITICAL REQUIREMENTS:
-        - Create EXACTLY {num_modules} modules to cover {deadline_weeks} weeks (each module ~{module_duration})
-        - Distribute the {total_hours} total hours across ALL modules evenly
-        - Each module should have 3-5 high-quality resources appropriate for {difficulty_level} level
-        
-        RESOURCE URL REQUIREMENTS (IN ORDER OF PRIORITY):
-        1. **YouTube Videos (PREFERRED)**: Use real YouTube video URLs whenever possible
-           - Format: https://www.youtube.com/watch?v=VIDEO_ID
-           - Popular channels: freeCodeCamp.org, Traversy Media, Fireship, Programming with Mosh, The Net Ninja, Corey Schafer, Academind, Kevin Powell, Web Dev Simplified
-           - Use recent videos (2023-2025) from these verified channels
-           - Example: "https://www.youtube.com/watch?v=rfscVS0vtbw" (Python Full Course)
-           
-        2. **Interactive Coding Platforms**: 
-           - freeCodeCamp.org, Codecademy, Scrimba, CodePen, CodeSandbox
-           - These embed well and are interactive
-           
-        3. **Documentation & Articles (use sparingly)**:
-           - Official docs: React docs, Python docs, MDN Web Docs
-           - Only use when video tutorials don't exist
-        
-        - Prioritize 70% YouTube videos, 20% interactive platforms, 10% documentation
-        - Each resource MUST have a valid, specific URL (no placeholders or search URLs)
-        - Use actual YouTube video URLs, not search results
-        - Total hours should not exceed {total_hours}
-        - Order modules logically: basics → intermediate → advanced → practical projects
-        - Include at least one hands-on project or practice exercise per module
-        """
+        # Extract skill names from skill gap objects, dropping duplicates but keeping order
+        raw_names = [gap['skill'] if isinstance(gap, dict) else gap for gap in (skill_gaps or [])]
+        skill_names = list(dict.fromkeys(raw_names))
+        
+        num_modules, module_duration = _module_plan(deadline_weeks)
+        guidance = DIFFICULTY_GUIDANCE.get(difficulty_level, DIFFICULTY_GUIDANCE["intermediate"])
+        
+        prompt = _ROADMAP_PROMPT_TEMPLATE.format(
+            target_role=target_role,
+            skills=', '.join(skill_names),
+            deadline_weeks=deadline_weeks,
+            available_hours_per_week=available_hours_per_week,
+            total_hours=total_hours,
+            difficulty_level=difficulty_level,
+            difficulty_label=difficulty_level.upper(),
+            guidance=guidance,
+            num_modules=num_modules,
+            module_duration=module_duration
+        )
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                response_format={"type": "json_object"}
-            )
-            
-            result = json.loads(response.choices[0].message.content)
+            content = await self._complete(prompt, temperature=0.7, json_mode=True)
+            result = orjson.loads(content)
             
             # Validate we got modules
             if not result.get("modules"):
@@ -260,19 +300,10 @@ class AIService:
                     {
                         "title": f"Learn {skill_names[0] if skill_names else 'Fundamentals'}",
                         "description": "Get started with the basics",
-                        "skills_covered": skill_names[:2] if len(skill_names) >= 2 else skill_names,
+                        "skills_covered": skill_names[:2],
                         "estimated_hours": 20,
                         "order": 0,
-                        "resources": [
-                            {
-                                "title": "Getting Started Guide",
-                                "url": "https://www.example.com",
-                                "description": "Beginner-friendly introduction",
-                                "estimated_hours": 10,
-                                "resource_type": "course",
-                                "order": 0
-                            }
-                        ]
+                        "resources": [dict(_ROADMAP_FALLBACK_RESOURCE)]
                     }
                 ]
             }
@@ -297,13 +328,8 @@ class AIService:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.8
-            )
-            
-            return response.choices[0].message.content.strip()
+            content = await self._complete(prompt, temperature=0.8)
+            return content.strip()
         except Exception:
             return "Great job completing this module! Keep up the excellent work on your learning journey."
     
@@ -360,14 +386,8 @@ class AIService:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                response_format={"type": "json_object"}
-            )
-            
-            result = json.loads(response.choices[0].message.content)
+            content = await self._complete(prompt, temperature=0.7, json_mode=True)
+            result = orjson.loads(content)
             
             # Handle if result is wrapped in a key or is direct array
             if isinstance(result, dict):
@@ -401,56 +421,53 @@ class AIService:
         """
         Validate YouTube URLs in roadmap resources and replace unavailable ones with alternatives
         """
-        youtube_validator = YouTubeValidator()
-        fixed_modules = []
-        
-        for module_data in roadmap_data.get("modules", []):
-            fixed_resources = []
+        modules = roadmap_data.setdefault("modules", [])
+        
+        # Group YouTube resources by URL so each distinct video is probed only once
+        url_to_positions = {}
+        for module_index, module_data in enumerate(modules):
+            for resource_index, resource in enumerate(module_data.setdefault("resources", [])):
+                if _YT_RE.match(resource["url"]):
+                    url_to_positions.setdefault(resource["url"], []).append((module_index, resource_index))
+        
+        unique_urls = list(url_to_positions)
+        verdicts = await YouTubeValidator.validate_many(unique_urls)
+        
+        for url, verdict in zip(unique_urls, verdicts):
+            if isinstance(verdict, Exception):
+                # Keep original resources if validation fails
+                continue
             
-            for resource in module_data.get("resources", []):
-                # Check if it's a YouTube URL
-                if "youtube.com" in resource["url"] or "youtu.be" in resource["url"]:
-                    try:
-                        # Validate the YouTube video
-                        is_available, video_id = await youtube_validator.is_video_available(resource["url"])
-                        
-                        if not is_available:
-                            # Ask AI to suggest an alternative resource
-                            alternative = await self._get_alternative_resource(
-                                resource["title"],
-                                resource.get("description", ""),
-                                module_data.get("description", "")
-                            )
-                            
-                            if alternative:
-                                fixed_resources.append(alternative)
-                            else:
-                                # Keep the original but flag it
-                                fixed_resources.append(resource)
-                        else:
-                            # Video is available, standardize URL
-                            fixed_url = f"https://www.youtube.com/watch?v={video_id}"
-                            resource["url"] = fixed_url
-                            fixed_resources.append(resource)
-                    
-                    except Exception:
-                        # Keep original resource if validation fails
-                        fixed_resources.append(resource)
-                else:
-                    # Non-YouTube resources don't need validation
-                    fixed_resources.append(resource)
-            
-            # Update module with fixed resources
-            module_data["resources"] = fixed_resources
-            fixed_modules.append(module_data)
+            is_available, video_id = verdict
+            for module_index, resource_index in url_to_positions[url]:
+                module_data = modules[module_index]
+                resource = module_data["resources"][resource_index]
+                
+                if is_available:
+                    # Video is available, standardize URL
+                    resource["url"] = f"https://www.youtube.com/watch?v={video_id}"
+                    continue
+                
+                # Ask AI to suggest an alternative resource, keeping the original if none is found
+                alternative = await self._get_alternative_resource(
+                    resource["title"],
+                    resource.get("description", ""),
+                    module_data.get("description", "")
+                )
+                if alternative:
+                    module_data["resources"][resource_index] = alternative
         
-        roadmap_data["modules"] = fixed_modules
         return roadmap_data
 
     async def _get_alternative_resource(self, title: str, description: str, module_description: str) -> Dict:
         """
         Use AI to suggest an alternative resource when YouTube video is unavailable
         """
+        # Serve a curated resource for well-known skills without an LLM round trip
+        for word in _WORD_RE.findall(title.lower()):
+            if word in CURATED_FALLBACKS:
+                return dict(CURATED_FALLBACKS[word][0])
+        
         prompt = f"""
         A YouTube video resource is unavailable. Suggest ONE alternative resource.
         
@@ -478,14 +495,8 @@ class AIService:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.3,
-                response_format={"type": "json_object"}
-            )
-            
-            result = json.loads(response.choices[0].message.content)
+            content = await self._complete(prompt, temperature=0.3, json_mode=True)
+            result = orjson.loads(content)
             return result if result.get("url") else None
         except Exception:
             return None
@@ -2,65 +2,15 @@
 Chatbot service using Groq API for intelligent PATHFORGE assistance
 """
 import os
-from typing import List, Dict
-from groq import Groq
-import asyncio
-from functools import partial
-import json
+import ahocorasick
+from typing import AsyncIterator, List, Dict
+from groq import AsyncGroq
+from cachetools import TTLCache
+from services.http_client import groq_http_client
 
-class ChatbotService:
-    def __init__(self):
-        self.client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-        self.model = "llama-3.3-70b-versatile"  # Fast and capable model
-        
-    async def chat(self, messages: List[Dict[str, str]], user_context: Dict = None) -> str:
-        """
-        Send a chat message and get AI response for PATHFORGE
-        
-        Args:
-            messages: List of message dicts with 'role' and 'content'
-            user_context: Optional context about user (skills, roadmap progress, etc.)
-        
-        Returns:
-            AI response text with PATHFORGE navigation help if needed
-        """
-        try:
-            # Build system prompt with PATHFORGE context
-            system_prompt = self._build_pathforge_system_prompt(user_context)
-            
-            # Prepare messages with system prompt
-            chat_messages = [
-                {"role": "system", "content": system_prompt}
-            ] + messages
-            
-            # Call Groq API in thread pool (sync operation)
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                partial(
-                    self.client.chat.completions.create,
-                    model=self.model,
-                    messages=chat_messages,
-                    temperature=0.7,
-                    max_tokens=1500,
-                    top_p=0.9,
-                )
-            )
-            
-            response_text = response.choices[0].message.content
-            
-            # Enhance response with PATHFORGE commands if detected
-            enhanced_response = self._add_pathforge_guidance(response_text, messages[-1]['content'] if messages else "")
-            
-            return enhanced_response
-            
-        except Exception:
-            raise Exception("Chatbot service error occurred")
-
-    
-    def _build_pathforge_system_prompt(self, user_context: Dict = None) -> str:
-        """Build PATHFORGE-specific system prompt"""
-        base_prompt = """You are PathForge AI Assistant - an expert learning companion specialized in helping developers build career-changing skills through structured learning paths.
+# Static instructions sent as the first system message; kept byte-identical across
+# requests so the provider's prompt prefix cache can reuse it
+PATHFORGE_BASE_PROMPT = """You are PathForge AI Assistant - an expert learning companion specialized in helping developers build career-changing skills through structured learning paths.
 
 PATHFORGE is a platform that:
 - Generates personalized learning roadmaps using AI
@@ -98,53 +48,213 @@ Response Format:
 - Include relevant PATHFORGE features they should use
 - End with actionable next steps"""
 
-        if user_context:
-            context_info = "\n\n📊 CURRENT USER CONTEXT:"
-            if user_context.get("current_roadmap"):
-                context_info += f"\n- Learning Path: {user_context['current_roadmap']}"
-            if user_context.get("skills"):
-                context_info += f"\n- Current Skills: {', '.join(user_context['skills'][:8])}"
-            if user_context.get("progress"):
-                context_info += f"\n- Progress: {user_context['progress']}% complete"
-            if user_context.get("xp"):
-                context_info += f"\n- XP Earned: {user_context['xp']}"
-            if user_context.get("level"):
-                context_info += f"\n- Current Level: {user_context['level']}"
+_BASE_SYSTEM_MESSAGE = {"role": "system", "content": PATHFORGE_BASE_PROMPT}
+
+# Question keywords per guidance topic, in priority order
+_GUIDANCE_TOPICS = (
+    ("roadmap", ("roadmap", "generate", "learning path", "how to start")),
+    ("project", ("project", "build", "practice")),
+    ("skill", ("skill", "gap", "what do i need", "requirement")),
+    ("progress", ("progress", "track", "xp", "level", "achievement", "streak")),
+    ("resource", ("resource", "course", "video", "tutorial", "learn")),
+    ("help", ("help", "how to", "navigate", "where", "what is")),
+)
+
+def _build_guidance_automaton() -> ahocorasick.Automaton:
+    """Aho-Corasick automaton mapping each question keyword to the topics it signals"""
+    keyword_topics: Dict[str, List[str]] = {}
+    for name, keywords in _GUIDANCE_TOPICS:
+        for keyword in keywords:
+            keyword_topics.setdefault(keyword, []).append(name)
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, topics in keyword_topics.items():
+        automaton.add_word(keyword, tuple(topics))
+    automaton.make_automaton()
+    return automaton
+
+# Finds every keyword, including overlapping ones (e.g. "xp" inside "experience"), in one linear pass
+_GUIDANCE_AUTOMATON = _build_guidance_automaton()
+
+class ChatbotService:
+    def __init__(self):
+        self.client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"), http_client=groq_http_client)
+        self.model = "llama-3.3-70b-versatile"  # Fast and capable model
+        # Responses to single-turn questions keyed by rendered user context and normalized question text
+        self._response_cache = TTLCache(maxsize=1024, ttl=3600)
+        
+    async def chat(self, messages: List[Dict[str, str]], user_context: Dict = None) -> str:
+        """
+        Send a chat message and get AI response for PATHFORGE
+        
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            user_context: Optional context about user (skills, roadmap progress, etc.)
+        
+        Returns:
+            AI response text with PATHFORGE navigation help if needed
+        """
+        try:
+            # Build system messages with PATHFORGE context
+            system_messages = self._build_pathforge_system_prompt(user_context)
+            
+            cache_key = self._cache_key(system_messages, messages)
+            if cache_key is not None and cache_key in self._response_cache:
+                return self._add_pathforge_guidance(self._response_cache[cache_key], messages[-1]['content'])
+            
+            # Prepare messages with system prompt
+            chat_messages = system_messages + messages
+            
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=chat_messages,
+                temperature=0.7,
+                max_tokens=1500,
+                top_p=0.9,
+            )
             
-            return base_prompt + context_info
+            response_text = response.choices[0].message.content
+            if cache_key is not None:
+                self._response_cache[cache_key] = response_text
+            
+            # Enhance response with PATHFORGE commands if detected
+            enhanced_response = self._add_pathforge_guidance(response_text, messages[-1]['content'] if messages else "")
+            
+            return enhanced_response
+            
+        except Exception:
+            raise Exception("Chatbot service error occurred")
+
+    async def chat_stream(self, messages: List[Dict[str, str]], user_context: Dict = None) -> AsyncIterator[str]:
+        """
+        Start streaming the AI response for PATHFORGE
         
-        return base_prompt
+        The Groq request is opened before returning, so a failed request raises here rather
+        than after response headers are sent. Returns an iterator of response text chunks,
+        followed by PATHFORGE navigation help if needed
+        """
+        user_question = messages[-1]['content'] if messages else ""
+        system_messages = self._build_pathforge_system_prompt(user_context)
+        cache_key = self._cache_key(system_messages, messages)
+        if cache_key is not None and cache_key in self._response_cache:
+            return self._yield_text(self._add_pathforge_guidance(self._response_cache[cache_key], user_question))
+        
+        chat_messages = system_messages + messages
+        
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=chat_messages,
+                temperature=0.7,
+                max_tokens=1500,
+                top_p=0.9,
+                stream=True,
+            )
+        except Exception:
+            raise Exception("Chatbot service error occurred")
+        
+        return self._relay_stream(stream, cache_key, user_question)
+    
+    @staticmethod
+    async def _yield_text(text: str) -> AsyncIterator[str]:
+        """Yield an already complete response as a single chunk"""
+        yield text
+    
+    async def _relay_stream(self, stream, cache_key: str | None, user_question: str) -> AsyncIterator[str]:
+        """Yield text chunks from an open Groq stream, then PATHFORGE navigation help if needed"""
+        parts = []
+        # Closing the stream releases its connection back to the shared pool even when the
+        # client disconnects or the stream fails before being fully consumed
+        async with stream:
+            try:
+                async for chunk in stream:
+                    content = chunk.choices[0].delta.content if chunk.choices else None
+                    if content:
+                        parts.append(content)
+                        yield content
+            except Exception:
+                # Headers are already sent, so report the failure in the body and don't cache the partial answer
+                yield "\n\n⚠️ The response was interrupted. Please try again."
+                return
+        
+        response_text = "".join(parts)
+        if cache_key is not None:
+            self._response_cache[cache_key] = response_text
+        
+        guidance = self._pathforge_guidance(response_text, user_question)
+        if guidance:
+            yield guidance
+    
+    @staticmethod
+    def _cache_key(system_messages: List[Dict[str, str]], messages: List[Dict[str, str]]) -> tuple | None:
+        """
+        Cache key for a chat request, or None for multi-turn conversations
+        
+        Keyed on the rendered user context rather than the raw context dict, so users whose
+        context renders the same (e.g. new users with no skills or progress yet) share answers
+        """
+        if len(messages) != 1 or messages[0].get('role') != 'user':
+            return None
+        context = tuple(message['content'] for message in system_messages[1:])
+        return context, ' '.join(messages[0]['content'].lower().split())
+    
+    def _build_pathforge_system_prompt(self, user_context: Dict = None) -> List[Dict[str, str]]:
+        """Build PATHFORGE-specific system messages: the static base prompt, then any user context"""
+        if not user_context:
+            return [_BASE_SYSTEM_MESSAGE]
+        
+        context_lines = ["📊 CURRENT USER CONTEXT:"]
+        if user_context.get("current_roadmap"):
+            context_lines.append(f"- Learning Path: {user_context['current_roadmap']}")
+        if user_context.get("skills"):
+            context_lines.append(f"- Current Skills: {', '.join(user_context['skills'][:8])}")
+        if user_context.get("progress"):
+            context_lines.append(f"- Progress: {user_context['progress']}% complete")
+        if user_context.get("xp"):
+            context_lines.append(f"- XP Earned: {user_context['xp']}")
+        if user_context.get("level"):
+            context_lines.append(f"- Current Level: {user_context['level']}")
+        
+        if len(context_lines) == 1:
+            return [_BASE_SYSTEM_MESSAGE]  # Nothing known about the user yet
+        
+        return [_BASE_SYSTEM_MESSAGE, {"role": "system", "content": "\n".join(context_lines)}]
     
     def _add_pathforge_guidance(self, response: str, user_question: str) -> str:
         """Add PATHFORGE navigation guidance to response"""
-        question_lower = user_question.lower()
-        
-        # Detect what user is asking about
+        return response + self._pathforge_guidance(response, user_question)
+    
+    def _pathforge_guidance(self, response: str, user_question: str) -> str:
+        """PATHFORGE navigation guidance to append to a response, or an empty string"""
+        # Detect what user is asking about in one scan, then take the highest-priority topic
+        matched = {topic for _, topics in _GUIDANCE_AUTOMATON.iter(user_question.lower()) for topic in topics}
+        topic = next((name for name, _ in _GUIDANCE_TOPICS if name in matched), None)
+        response_lower = response.lower()
         guidance = ""
         
-        if any(word in question_lower for word in ["roadmap", "generate", "learning path", "how to start"]):
-            if "roadmap" not in response.lower():
+        if topic == "roadmap":
+            if "roadmap" not in response_lower:
                 guidance = "\n\n💡 **QUICK START:** Visit /roadmap/new to generate your personalized learning path!"
         
-        elif any(word in question_lower for word in ["project", "build", "practice"]):
-            if "template" not in response.lower():
+        elif topic == "project":
+            if "template" not in response_lower:
                 guidance = "\n\n🛠️ **BUILD PROJECTS:** Go to /projects > Templates tab to use ready-made project ideas!"
         
-        elif any(word in question_lower for word in ["skill", "gap", "what do i need", "requirement"]):
-            if "skill" not in response.lower() or "gap" not in response.lower():
+        elif topic == "skill":
+            if "skill" not in response_lower or "gap" not in response_lower:
                 guidance = "\n\n📚 **SKILL ANALYSIS:** Visit /skills to add your skills and see what's needed for your target role!"
         
-        elif any(word in question_lower for word in ["progress", "track", "xp", "level", "achievement", "streak"]):
+        elif topic == "progress":
             guidance = "\n\n🎮 **TRACK PROGRESS:** Your /dashboard shows XP, levels, 7-day streak, and 5 unlockable achievements!"
         
-        elif any(word in question_lower for word in ["resource", "course", "video", "tutorial", "learn"]):
-            if "resource" not in response.lower():
+        elif topic == "resource":
+            if "resource" not in response_lower:
                 guidance = "\n\n📖 **RESOURCES:** Your roadmap includes curated YouTube videos, courses, and documentation links!"
         
-        elif any(word in question_lower for word in ["help", "how to", "navigate", "where", "what is"]):
+        elif topic == "help":
             guidance = "\n\n🚀 **PATHFORGE FEATURES:**\n- /roadmap - Your learning paths\n- /projects - AI project ideas & templates\n- /skills - Track your skills\n- /dashboard - See your progress\n- /admin - Advanced settings"
         
-        return response + guidance if guidance else response
+        return guidance
 
 # Global instance
 chatbot_service = ChatbotService()
@@ -5,11 +5,17 @@ Provides multiple extraction strategies with fallback mechanisms
 
 from typing import Dict, List
 import os
+import asyncio
+import copy
+import hashlib
+import time
 from datetime import datetime
+from cachetools import TTLCache
 
 # Import existing services
 from services.resume_parser import ResumeParser
 from services.ai_service import AIService
+from services.skill_matcher import get_skill_matcher
 
 # Import new LangChain service
 try:
@@ -35,6 +41,16 @@ class EnhancedResumeParser:
         self.langchain_parser = None
         if LANGCHAIN_AVAILABLE:
             self.langchain_parser = LangChainResumeParser()
+        
+        # Lowercase skill name -> skill, rebuilt only when the skill database changes
+        self._skill_index: Dict[str, Dict] = {}
+        self._skill_index_names: tuple = None
+        
+        # In-flight LangChain extractions keyed by resume hash and skill database, shared by concurrent callers
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+        
+        # Finished LLM-backed extractions keyed by resume hash, method and skill database
+        self._result_cache = TTLCache(maxsize=512, ttl=86400)
     
     async def extract_skills(
         self, 
@@ -66,18 +82,30 @@ class EnhancedResumeParser:
             }
         """
         
-        start_time = datetime.now()
+        start_time = time.perf_counter()
+        
+        # Re-uploads and retries of the same resume skip the whole pipeline
+        cache_key = (self._resume_key(resume_text), method, self._skill_db_key(skill_database))
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            result = copy.deepcopy(cached)
+            result['processing_time'] = time.perf_counter() - start_time
+            result['timestamp'] = datetime.now().isoformat()
+            return result
+        
         result = None
         method_used = None
+        # Only results that really came from the LLM are cached; both LLM strategies
+        # swallow Groq errors and return a fallback instead of raising
+        cacheable = False
         
         # Strategy 1: Try LangChain RAG (best accuracy)
         if method in ["auto", "langchain"] and self.langchain_parser:
             try:
-                result = await self.langchain_parser.extract_skills_with_langchain(
-                    resume_text, 
-                    skill_database
-                )
+                result = await self._coalesced_langchain_extract(resume_text, skill_database)
                 method_used = "langchain_rag"
+                # The parser's own keyword fallback is tagged method="fallback"
+                cacheable = result.get('method') == 'LangChain_RAG'
                 
             except Exception:
                 if method == "langchain":
@@ -95,6 +123,9 @@ class EnhancedResumeParser:
                     skill_database
                 )
                 method_used = "direct_llm"
+                # A failed Groq call comes back as the empty default, indistinguishable
+                # from an empty extraction, so results without skills are never cached
+                cacheable = bool(llm_result.get("skills"))
                 
             except Exception:
                 if method == "llm":
@@ -108,16 +139,65 @@ class EnhancedResumeParser:
             method_used = "keyword_fallback"
         
         # Add metadata
-        processing_time = (datetime.now() - start_time).total_seconds()
         result['method_used'] = method_used
-        result['processing_time'] = processing_time
+        result['processing_time'] = time.perf_counter() - start_time
         result['timestamp'] = datetime.now().isoformat()
         
         # Calculate confidence score
         result['confidence'] = self._calculate_confidence(result, method_used)
         
+        # Fallback results are not cached so a transient LLM outage doesn't stick for a day
+        if cacheable:
+            self._result_cache[cache_key] = copy.deepcopy(result)
+        
         return result
     
+    @staticmethod
+    def _resume_key(resume_text: str) -> str:
+        """Stable hash of the resume text"""
+        return hashlib.blake2b(resume_text.encode(), digest_size=16).hexdigest()
+    
+    @staticmethod
+    def _skill_db_key(skill_database: List[Dict]) -> int:
+        """
+        Identity of a skill database for keying cached and in-flight extractions; covers every
+        field the LangChain skill documents are built from, so editing a skill invalidates results
+        """
+        return hash(tuple(
+            (str(skill.get('_id', '')), skill['name'], skill.get('category'), skill.get('description'),
+             tuple(skill['related_terms']) if 'related_terms' in skill else None)
+            for skill in skill_database
+        ))
+    
+    async def _coalesced_langchain_extract(self, resume_text: str, skill_database: List[Dict]) -> Dict:
+        """
+        Run LangChain extraction once per distinct resume text and skill database among
+        concurrent callers (double submits, client retries) and give each caller its own copy of the result
+        """
+        key = (self._resume_key(resume_text), self._skill_db_key(skill_database))
+        task = self._inflight.get(key)
+        
+        if task is None:
+            task = asyncio.ensure_future(
+                self.langchain_parser.extract_skills_with_langchain(resume_text, skill_database)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # Shield so one caller's cancellation doesn't cancel the shared extraction
+        return copy.deepcopy(await asyncio.shield(task))
+    
+    def _get_skill_index(self, skill_database: List[Dict]) -> Dict[str, Dict]:
+        """Return the lowercase-name lookup for this skill database, keeping the first skill per name"""
+        names = tuple(skill['name'] for skill in skill_database)
+        if names != self._skill_index_names:
+            index = {}
+            for skill in skill_database:
+                index.setdefault(skill['name'].lower(), skill)
+            self._skill_index = index
+            self._skill_index_names = names
+        return self._skill_index
+    
     def _convert_llm_to_standard_format(
         self, 
         llm_result: Dict, 
@@ -127,15 +207,11 @@ class EnhancedResumeParser:
         
         matched_skills = []
         resume_skills = llm_result.get("skills", [])
+        skill_index = self._get_skill_index(skill_database)
         
         # Match extracted skills with database
         for skill_name in resume_skills:
-            # Find in database
-            db_skill = next(
-                (s for s in skill_database 
-                 if s['name'].lower() == skill_name.lower()),
-                None
-            )
+            db_skill = skill_index.get(skill_name.lower())
             
             if db_skill:
                 matched_skills.append({
@@ -161,19 +237,18 @@ class EnhancedResumeParser:
     ) -> Dict:
         """Simple keyword matching as last resort"""
         
-        resume_lower = resume_text.lower()
-        matched_skills = []
-        
-        for skill in skill_database[:100]:  # Limit for performance
-            skill_name = skill['name']
-            if skill_name.lower() in resume_lower:
-                matched_skills.append({
-                    "name": skill_name,
-                    "skill_id": str(skill.get('_id', '')),
-                    "proficiency": "Beginner",
-                    "confidence": 0.5,
-                    "evidence": "keyword match"
-                })
+        # Single Aho-Corasick pass over the resume covers the whole skill database
+        matched_indices = get_skill_matcher(skill_database).find(resume_text.lower())
+        matched_skills = [
+            {
+                "name": skill_database[i]['name'],
+                "skill_id": str(skill_database[i].get('_id', '')),
+                "proficiency": "Beginner",
+                "confidence": 0.5,
+                "evidence": "keyword match"
+            }
+            for i in matched_indices
+        ]
         
         return {
             "matched_skills": matched_skills,
@@ -192,33 +267,32 @@ class EnhancedResumeParser:
             "keyword_fallback": 0.5
         }.get(method, 0.3)
         
+        # Individual skill confidences, summed and counted in one pass
+        total, skill_count = 0.0, 0
+        for s in result.get('matched_skills') or ():
+            total += s.get('confidence', 0.5)
+            skill_count += 1
+        
+        if skill_count == 0:
+            return base_confidence
+        
         # Boost confidence if multiple skills found
-        skill_count = len(result.get('matched_skills', []))
         if skill_count > 5:
             base_confidence = min(1.0, base_confidence + 0.05)
         
-        # Individual skill confidences
-        if 'matched_skills' in result and result['matched_skills']:
-            avg_skill_confidence = sum(
-                s.get('confidence', 0.5) for s in result['matched_skills']
-            ) / len(result['matched_skills'])
-            
-            # Weighted average
-            return (base_confidence * 0.6) + (avg_skill_confidence * 0.4)
-        
-        return base_confidence
+        # Weighted average
+        return (base_confidence * 0.6) + (total / skill_count * 0.4)
     
     async def build_skill_knowledge_base(self, skill_database: List[Dict]):
         """Pre-build LangChain vector store for faster future extractions"""
         if self.langchain_parser:
             await self.langchain_parser.build_skill_knowledge_base(skill_database)
-            self.langchain_parser.save_vector_store()
     
-    async def load_skill_knowledge_base(self):
-        """Load pre-built vector store"""
+    async def load_skill_knowledge_base(self, skill_database: List[Dict]):
+        """Load the persisted vector store for this skill database, building it if there is none"""
         if self.langchain_parser:
-            success = self.langchain_parser.load_vector_store()
-            return success
+            await self.langchain_parser.build_skill_knowledge_base(skill_database)
+            return self.langchain_parser.vector_store is not None
         return False
 
 
@@ -0,0 +1,23 @@
+"""
+Shared HTTP clients for Groq API calls and YouTube availability checks
+Keeps one tuned connection pool per upstream so concurrent requests reuse warm HTTP/2 connections
+"""
+import httpx
+
+groq_http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+    timeout=httpx.Timeout(60.0, connect=10.0)
+)
+
+youtube_http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+    timeout=5.0
+)
+
+
+async def close_http_clients():
+    """Close the shared connection pools on application shutdown"""
+    await groq_http_client.aclose()
+    await youtube_http_client.aclose()
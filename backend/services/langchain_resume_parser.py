@@ -6,17 +6,223 @@ Uses LangChain for RAG pipeline with vector embeddings and retrieval chains
 from langchain_groq import ChatGroq
 from langchain_community.vectorstores import FAISS
 from langchain_huggingface import HuggingFaceEmbeddings
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.chains import RetrievalQA
 from langchain.prompts import PromptTemplate
-from langchain.schema import Document
-from typing import List, Dict
+from langchain.schema import Document, OutputParserException
+from langchain.output_parsers import PydanticOutputParser
+from pydantic import BaseModel, field_validator
+from groq import BadRequestError
+from typing import Any, List, Dict, Union
 import os
+import re
+import shutil
+import hashlib
 from dotenv import load_dotenv
-import json
+import orjson
+import faiss
+from services.http_client import groq_http_client
+
+# ONNX Runtime backend for sentence-transformers (pip install "sentence-transformers[onnx]")
+try:
+    import onnxruntime  # noqa: F401
+    import optimum  # noqa: F401
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
 
 load_dotenv()
 
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+# Prefer the int8-quantized ONNX export published with the model; falls back to PyTorch FP32
+if ONNX_AVAILABLE:
+    EMBEDDING_MODEL_KWARGS = {
+        'device': 'cpu',
+        'backend': 'onnx',
+        'model_kwargs': {'file_name': 'onnx/model_quint8_avx2.onnx'}
+    }
+else:
+    EMBEDDING_MODEL_KWARGS = {'device': 'cpu'}
+
+# Batched, normalized encoding so sentence-transformers runs full matmuls per batch
+EMBEDDING_ENCODE_KWARGS = {'batch_size': 64, 'normalize_embeddings': True}
+
+# Skill databases at least this large get an HNSW graph index instead of exhaustive FlatL2 search
+HNSW_MIN_SKILLS = 2000
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 80
+HNSW_EF_SEARCH = 32
+
+# Persisted skill indexes, one subdirectory per skill database version
+SKILL_VECTORSTORE_DIR = os.getenv(
+    "SKILL_VECTORSTORE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "skill_vectorstore")
+)
+_INDEX_KEY_RE = re.compile(r'[0-9a-f]{16}')
+
+# One embedding model per process, shared by every parser instead of loading the weights per class
+_EMBEDDINGS = HuggingFaceEmbeddings(
+    model_name=EMBEDDING_MODEL,
+    model_kwargs=EMBEDDING_MODEL_KWARGS,
+    encode_kwargs=EMBEDDING_ENCODE_KWARGS
+)
+
+
+def _skill_documents(skill_database: List[Dict]) -> List[Document]:
+    """Rich text representation of each skill, as embedded into the persisted skill index"""
+    documents = []
+    for skill in skill_database:
+        content = f"""
+            Skill: {skill['name']}
+            Category: {skill.get('category', 'General')}
+            Description: {skill.get('description', 'Technical skill')}
+            Related Terms: {', '.join(skill.get('related_terms', [skill['name']]))}
+            """
+        
+        metadata = {
+            'skill_id': str(skill.get('_id', '')),
+            'name': skill['name'],
+            'category': skill.get('category', '')
+        }
+        
+        documents.append(Document(page_content=content, metadata=metadata))
+    return documents
+
+
+def _skill_index_key(documents: List[Document]) -> str:
+    """
+    Stable key identifying the embedded skill documents and index setup, so any edit to
+    a skill's text or metadata (not just its name) produces a new index
+    """
+    parts = sorted(f"{doc.page_content}\x1f{sorted(doc.metadata.items())}" for doc in documents)
+    parts.append(
+        f"{EMBEDDING_MODEL}:{EMBEDDING_MODEL_KWARGS}:{sorted(EMBEDDING_ENCODE_KWARGS.items())}:"
+        f"hnsw={HNSW_MIN_SKILLS},{HNSW_M},{HNSW_EF_CONSTRUCTION},{HNSW_EF_SEARCH}"
+    )
+    return hashlib.sha256("\x1e".join(parts).encode()).hexdigest()[:16]
+
+
+def _skill_fields(skill_database: List[Dict]) -> tuple:
+    """Every skill field that goes into the skill documents, as a hashable tuple"""
+    return tuple(
+        (str(skill.get('_id', '')), skill['name'], skill.get('category'), skill.get('description'),
+         tuple(skill['related_terms']) if 'related_terms' in skill else None)
+        for skill in skill_database
+    )
+
+
+# Skill fields -> index key, so the documents are only rendered and hashed once per skill database
+_index_keys: Dict[tuple, str] = {}
+_MAX_INDEX_KEYS = 8
+
+
+def skill_database_index_key(skill_database: List[Dict]) -> str:
+    """Return the cached persisted-index key for this skill database, computing it on first use"""
+    fields = _skill_fields(skill_database)
+    key = _index_keys.get(fields)
+    
+    if key is None:
+        if len(_index_keys) >= _MAX_INDEX_KEYS:
+            _index_keys.pop(next(iter(_index_keys)))
+        key = _skill_index_key(_skill_documents(skill_database))
+        _index_keys[fields] = key
+    
+    return key
+
+
+def _prune_skill_indexes(keep: str):
+    """Remove persisted indexes of superseded skill database versions"""
+    try:
+        entries = os.listdir(SKILL_VECTORSTORE_DIR)
+    except OSError:
+        return
+    
+    for entry in entries:
+        if entry != keep and _INDEX_KEY_RE.fullmatch(entry):
+            shutil.rmtree(os.path.join(SKILL_VECTORSTORE_DIR, entry), ignore_errors=True)
+
+
+def _use_hnsw_index(vector_store: FAISS) -> FAISS:
+    """Swap a large store's FlatL2 index for HNSW over the same vectors and docstore ids"""
+    flat_index = vector_store.index
+    if flat_index.ntotal < HNSW_MIN_SKILLS:
+        return vector_store
+    
+    hnsw_index = faiss.IndexHNSWFlat(flat_index.d, HNSW_M)
+    hnsw_index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+    hnsw_index.add(flat_index.reconstruct_n(0, flat_index.ntotal))
+    hnsw_index.hnsw.efSearch = HNSW_EF_SEARCH
+    
+    vector_store.index = hnsw_index
+    return vector_store
+
+
+_NUMBER_RE = re.compile(r'\d+(?:\.\d+)?')
+
+
+def _lenient_number(value: Any, default: Union[int, float]) -> Union[int, float]:
+    """Read a number from loose LLM output such as "3+" or "5 years", or return the default"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    match = _NUMBER_RE.search(str(value)) if value is not None else None
+    if not match:
+        return default
+    number = float(match.group())
+    return int(number) if number.is_integer() else number
+
+
+class MatchedSkill(BaseModel):
+    """A database skill found in the resume"""
+    name: str
+    proficiency: str = "Intermediate"
+    confidence: float = 0.5
+    evidence: str = ""
+    
+    @field_validator("proficiency", "evidence", mode="before")
+    @classmethod
+    def _text_or_default(cls, value, info):
+        return cls.model_fields[info.field_name].default if value is None else str(value)
+    
+    @field_validator("confidence", mode="before")
+    @classmethod
+    def _confidence(cls, value):
+        return _lenient_number(value, 0.5)
+
+
+class SkillExtraction(BaseModel):
+    """Structured LLM output of resume skill extraction; nulls and loose values fall back to defaults"""
+    matched_skills: List[MatchedSkill] = []
+    additional_skills: List[str] = []
+    experience_years: Union[int, float] = 0
+    education: str = ""
+    job_titles: List[str] = []
+    
+    @field_validator("matched_skills", mode="before")
+    @classmethod
+    def _named_skills(cls, value):
+        # Drop entries the model returned without a skill name rather than failing the whole extraction
+        if not isinstance(value, list):
+            return []
+        return [s for s in value if isinstance(s, dict) and s.get("name")]
+    
+    @field_validator("additional_skills", "job_titles", mode="before")
+    @classmethod
+    def _text_list(cls, value):
+        if isinstance(value, str):
+            return [value]
+        if not isinstance(value, list):
+            return []
+        return [str(item) for item in value if item is not None]
+    
+    @field_validator("experience_years", mode="before")
+    @classmethod
+    def _experience_years(cls, value):
+        return _lenient_number(value, 0)
+    
+    @field_validator("education", mode="before")
+    @classmethod
+    def _education(cls, value):
+        return "" if value is None else str(value)
+
 
 class LangChainResumeParser:
     """Resume parser using LangChain RAG pipeline"""
@@ -26,47 +232,53 @@ class LangChainResumeParser:
         self.llm = ChatGroq(
             groq_api_key=os.getenv("GROQ_API_KEY"),
             model_name="llama-3.3-70b-versatile",
-            temperature=0.2
+            temperature=0.2,
+            http_async_client=groq_http_client
         )
+        # Groq JSON mode guarantees a parseable response for structured extraction
+        self.json_llm = self.llm.bind(response_format={"type": "json_object"})
+        self.extraction_parser = PydanticOutputParser(pydantic_object=SkillExtraction)
         
-        # Initialize embeddings (free, local model)
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2",
-            model_kwargs={'device': 'cpu'}
-        )
+        # Shared embeddings (free, local model)
+        self.embeddings = _EMBEDDINGS
         
         self.vector_store = None
         self.retrieval_chain = None
+        self._index_key = None  # Skill database version the vector store was built from
+        self._explicitly_loaded = False  # Set by load_vector_store() to pin a store from a custom path
     
     async def build_skill_knowledge_base(self, skill_database: List[Dict]):
         """
         Build vector store from skill database
-        This only needs to be done once (or when skills are updated)
+        This only needs to be done once (or when skills are updated); a persisted
+        index for the same skill set is loaded instead of re-embedding the skills
         """
-        # Convert skills to Documents
-        documents = []
-        for skill in skill_database:
-            # Create rich text representation of each skill
-            content = f"""
-            Skill: {skill['name']}
-            Category: {skill.get('category', 'General')}
-            Description: {skill.get('description', 'Technical skill')}
-            Related Terms: {', '.join(skill.get('related_terms', [skill['name']]))}
-            """
-            
-            metadata = {
-                'skill_id': str(skill.get('_id', '')),
-                'name': skill['name'],
-                'category': skill.get('category', '')
-            }
-            
-            documents.append(Document(page_content=content, metadata=metadata))
-        
-        # Create vector store with FAISS (fast similarity search)
-        self.vector_store = FAISS.from_documents(documents, self.embeddings)
+        self._explicitly_loaded = False
+        await self._ensure_vector_store(skill_database)
         
         return self.vector_store
     
+    async def _ensure_vector_store(self, skill_database: List[Dict]):
+        """
+        Make sure the vector store matches the skill database, loading a persisted
+        index for this skill set when available and only embedding skills on a miss
+        """
+        if self._explicitly_loaded:
+            return
+        
+        key = skill_database_index_key(skill_database)
+        if key == self._index_key:
+            return
+        
+        path = os.path.join(SKILL_VECTORSTORE_DIR, key)
+        if not self._load_local(path):
+            # Create vector store with FAISS (fast similarity search)
+            documents = _skill_documents(skill_database)
+            self.vector_store = _use_hnsw_index(await FAISS.afrom_documents(documents, self.embeddings))
+            self.vector_store.save_local(path)
+            _prune_skill_indexes(keep=key)
+        self._index_key = key
+    
     async def extract_skills_with_langchain(
         self, 
         resume_text: str,
@@ -80,9 +292,8 @@ class LangChainResumeParser:
         3. Use LLM to extract and validate skills with retrieved context
         """
         
-        # Step 1: Build knowledge base if not exists
-        if self.vector_store is None:
-            await self.build_skill_knowledge_base(skill_database)
+        # Step 1: Build or load the knowledge base for this skill database
+        await self._ensure_vector_store(skill_database)
         
         # Step 2: Retrieve relevant skills using semantic search
         retriever = self.vector_store.as_retriever(
@@ -90,7 +301,7 @@ class LangChainResumeParser:
             search_kwargs={"k": top_k}
         )
         
-        relevant_docs = retriever.get_relevant_documents(resume_text)
+        relevant_docs = await retriever.ainvoke(resume_text)
         
         # Extract skill names from retrieved docs
         retrieved_skills = [doc.metadata['name'] for doc in relevant_docs]
@@ -145,13 +356,9 @@ Return ONLY valid JSON with this structure:
                 "skill_context": retrieved_context[:4000]  # Limit context size
             }
             
-            formatted_prompt = extraction_prompt.format(**chain_input)
-            
-            # Invoke LLM
-            response = self.llm.invoke(formatted_prompt)
-            
-            # Parse JSON response
-            result = json.loads(response.content)
+            chain = extraction_prompt | self.json_llm | self.extraction_parser
+            extraction = await chain.ainvoke(chain_input)
+            result = extraction.model_dump()
             
             # Add metadata
             result['retrieval_count'] = len(relevant_docs)
@@ -160,8 +367,6 @@ Return ONLY valid JSON with this structure:
             
             return result
             
-        except json.JSONDecodeError:
-            return self._fallback_extraction(resume_text, retrieved_skills)
         except Exception:
             return self._fallback_extraction(resume_text, retrieved_skills)
     
@@ -174,8 +379,7 @@ Return ONLY valid JSON with this structure:
         Alternative approach using LangChain's RetrievalQA chain
         Simpler but less customizable
         """
-        if self.vector_store is None:
-            await self.build_skill_knowledge_base(skill_database)
+        await self._ensure_vector_store(skill_database)
         
         # Create RetrievalQA chain
         qa_chain = RetrievalQA.from_chain_type(
@@ -193,8 +397,8 @@ Return ONLY valid JSON with this structure:
         """
         
         try:
-            result = qa_chain.invoke({"query": query})
-            return json.loads(result['result'])
+            result = await qa_chain.ainvoke({"query": query})
+            return orjson.loads(result['result'])
         except:
             return {"matched_skills": [], "method": "RetrievalQA_fallback"}
     
@@ -218,13 +422,25 @@ Return ONLY valid JSON with this structure:
             "method": "fallback"
         }
     
-    def save_vector_store(self, path: str = "./skill_vectorstore"):
-        """Save vector store to disk for reuse"""
-        if self.vector_store:
+    def save_vector_store(self, path: str = None):
+        """Save vector store to disk for reuse, by default under its skill database version"""
+        if path is None and self._index_key is not None:
+            path = os.path.join(SKILL_VECTORSTORE_DIR, self._index_key)
+        if self.vector_store and path:
             self.vector_store.save_local(path)
     
-    def load_vector_store(self, path: str = "./skill_vectorstore"):
-        """Load pre-built vector store from disk"""
+    def load_vector_store(self, path: str):
+        """
+        Load a pre-built vector store from disk and use it for every extraction,
+        regardless of the skill database passed in
+        """
+        self._explicitly_loaded = self._load_local(path)
+        if self._explicitly_loaded:
+            self._index_key = None
+        return self._explicitly_loaded
+    
+    def _load_local(self, path: str) -> bool:
+        """Load a persisted vector store, returning whether one was found"""
         try:
             self.vector_store = FAISS.load_local(
                 path, 
@@ -248,12 +464,30 @@ class LangChainAdvancedExtractor:
         self.llm = ChatGroq(
             groq_api_key=os.getenv("GROQ_API_KEY"),
             model_name="llama-3.3-70b-versatile",
-            temperature=0.2
+            temperature=0.2,
+            http_async_client=groq_http_client
         )
+        # Same JSON-mode structured output as LangChainResumeParser
+        self.json_llm = self.llm.bind(response_format={"type": "json_object"})
+        self.extraction_parser = PydanticOutputParser(pydantic_object=SkillExtraction)
         
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2"
-        )
+        self.embeddings = _EMBEDDINGS
+        
+        # Skill vector store reused across calls until the skill database changes
+        self._vector_store = None
+        self._skill_fields = None
+    
+    async def _get_vector_store(self, skill_database: List[Dict]):
+        """Return the cached skill vector store, rebuilding it only for a new skill database"""
+        fields = _skill_fields(skill_database)
+        if fields != self._skill_fields:
+            documents = [
+                Document(page_content=f"{s['name']} {s.get('description', '')}", metadata={'name': s['name']})
+                for s in skill_database
+            ]
+            self._vector_store = _use_hnsw_index(await FAISS.afrom_documents(documents, self.embeddings))
+            self._skill_fields = fields
+        return self._vector_store
     
     async def extract_with_multi_step_chain(
         self,
@@ -261,50 +495,53 @@ class LangChainAdvancedExtractor:
         skill_database: List[Dict]
     ) -> Dict:
         """
-        Multi-step extraction:
-        1. Extract keywords
-        2. Retrieve relevant skills
-        3. Validate and enrich
+        Two-step extraction:
+        1. Retrieve relevant skills by embedding the resume directly
+        2. Validate and enrich them in a single LLM call
         """
         
-        # Step 1: Keyword extraction
-        keyword_prompt = PromptTemplate(
-            template="Extract all technical keywords and skills from this resume. Return as comma-separated list:\n\n{resume}",
-            input_variables=["resume"]
-        )
+        # Step 1: Semantic retrieval
+        vector_store = await self._get_vector_store(skill_database)
         
-        keywords_response = self.llm.invoke(keyword_prompt.format(resume=resume_text))
-        keywords = keywords_response.content
+        relevant_skills = await vector_store.asimilarity_search(resume_text, k=15)
+        skill_names = [doc.metadata['name'] for doc in relevant_skills]
         
-        # Step 2: Semantic retrieval
-        vector_store = FAISS.from_documents(
-            [Document(page_content=f"{s['name']} {s.get('description', '')}") 
-             for s in skill_database],
-            self.embeddings
-        )
-        
-        relevant_skills = vector_store.similarity_search(keywords, k=15)
-        skill_names = [doc.page_content.split()[0] for doc in relevant_skills]
-        
-        # Step 3: Validation and enrichment
+        # Step 2: Validation and enrichment
         validation_prompt = PromptTemplate(
-            template="""
-Given these potential skills: {skills}
+            template="""You are an expert resume analyzer.
+
+POTENTIAL SKILLS FROM OUR DATABASE: {skills}
+
+RESUME TEXT:
+{resume}
 
-And this resume: {resume}
+Identify which of the potential skills are ACTUALLY mentioned in the resume (exact matches,
+synonyms or related terms), estimate proficiency from experience, projects and job titles,
+and quote brief evidence.
 
-Which skills are ACTUALLY mentioned? Return JSON with name, proficiency, evidence.
-""",
+Return ONLY valid JSON with this structure:
+{{
+    "matched_skills": [
+        {{
+            "name": "exact skill name from our database",
+            "proficiency": "Beginner|Intermediate|Advanced|Expert",
+            "confidence": 0.0-1.0,
+            "evidence": "brief quote from resume"
+        }}
+    ],
+    "additional_skills": ["skills not in our database"],
+    "experience_years": <number>,
+    "education": "highest degree",
+    "job_titles": ["title1", "title2"]
+}}""",
             input_variables=["skills", "resume"]
         )
         
-        final_response = self.llm.invoke(
-            validation_prompt.format(skills=", ".join(skill_names), resume=resume_text)
-        )
-        
-        print(f"✅ [STEP 3] Validation complete")
+        chain = validation_prompt | self.json_llm | self.extraction_parser
         
         try:
-            return json.loads(final_response.content)
-        except:
+            extraction = await chain.ainvoke({"skills": ", ".join(skill_names), "resume": resume_text})
+            return extraction.model_dump()
+        except (OutputParserException, BadRequestError):
+            # JSON mode rejects a malformed generation as a 400 json_validate_failed
             return {"matched_skills": [], "method": "multi_step_chain"}
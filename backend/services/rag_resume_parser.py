@@ -3,27 +3,61 @@ RAG-Enhanced Resume Skills Extraction
 Combines retrieval from skill database with LLM generation for better accuracy
 """
 
-from groq import Groq
+from groq import AsyncGroq
 import os
-from typing import List, Dict
+import orjson
+import asyncio
+import hashlib
+import re
+from collections import Counter
+from typing import List, Dict, Tuple
 from dotenv import load_dotenv
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.base import clone
+from sklearn.feature_extraction.text import TfidfVectorizer, ENGLISH_STOP_WORDS
+from services.http_client import groq_http_client
+from services.skill_matcher import get_skill_matcher
 
 load_dotenv()
 
+# Unfitted TF-IDF configuration for skill retrieval, cloned for each skill database
+_VECTORIZER_TEMPLATE = TfidfVectorizer(
+    max_features=500,
+    ngram_range=(1, 2),  # Unigrams and bigrams
+    stop_words='english',
+    sublinear_tf=True,  # 1 + log(tf) so repeated terms don't dominate
+    norm='l2',  # Unit rows make cosine similarity a plain dot product
+    dtype=np.float32
+)
+
+# Fitted vectorizers for recently seen skill databases
+_MAX_SKILL_CACHE = 8
+
+# Context keywords hinting at proficiency, checked from most to least senior
+_EXPERT_RE = re.compile(r'expert|senior|lead|architect|advanced')
+_INTERMEDIATE_RE = re.compile(r'experience|proficient|worked with|developed')
+_BEGINNER_RE = re.compile(r'learning|basic|familiar|introduced')
+_TOKEN_RE = re.compile(r'\b\w+\b')
+
+
+def _top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first; partitions in O(N) and sorts only the top k"""
+    if k < len(scores):
+        candidates = np.argpartition(scores, -k)[-k:]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(scores[candidates])[::-1]]
+
+
 class RAGResumeParser:
     """Enhanced resume parser using Retrieval Augmented Generation"""
     
     def __init__(self):
-        self.client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+        self.client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"), http_client=groq_http_client)
         self.model = "llama-3.3-70b-versatile"
-        self.vectorizer = TfidfVectorizer(
-            max_features=500,
-            ngram_range=(1, 2),  # Unigrams and bigrams
-            stop_words='english'
-        )
+        
+        # Skill database hash -> (vectorizer fitted on the skills, skill TF-IDF matrix)
+        self._skill_cache: Dict[str, Tuple[TfidfVectorizer, object]] = {}
     
     async def extract_skills_with_rag(
         self, 
@@ -41,8 +75,8 @@ class RAGResumeParser:
         relevant_skills = self._retrieve_relevant_skills(resume_text, skill_database)
         
         # Step 2: Create augmented prompt
-        skill_names = [s['name'] for s in relevant_skills]
-        skill_descriptions = [f"{s['name']}: {s.get('description', '')}" for s in relevant_skills]
+        # Only the top 20 most relevant skills go into the prompt
+        skill_descriptions = [f"{s['name']}: {s.get('description', '')}" for s in relevant_skills[:20]]
         
         prompt = f"""
         You are an expert resume analyzer. Extract skills from the resume below.
@@ -51,7 +85,7 @@ class RAGResumeParser:
         {resume_text}
         
         RELEVANT SKILLS FROM OUR DATABASE:
-        {chr(10).join(skill_descriptions[:20])}  # Top 20 most relevant
+        {chr(10).join(skill_descriptions)}
         
         INSTRUCTIONS:
         1. Identify which skills from our database are mentioned in the resume
@@ -78,15 +112,14 @@ class RAGResumeParser:
         
         try:
             # Step 3: Generate with LLM
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.2,  # Lower temperature for more consistent extraction
                 response_format={"type": "json_object"}
             )
             
-            import json
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
             
             # Add metadata
             result['retrieval_count'] = len(relevant_skills)
@@ -97,6 +130,25 @@ class RAGResumeParser:
         except Exception:
             return self._fallback_extraction(resume_text, skill_database)
     
+    async def batch_extract(
+        self,
+        resumes: List[str],
+        skill_database: List[Dict],
+        max_concurrency: int = 10
+    ) -> List:
+        """
+        Extract skills from many resumes concurrently (e.g. admin bulk upload),
+        with at most max_concurrency Groq requests in flight.
+        Results are in input order; a failed extraction is returned as its exception.
+        """
+        sem = asyncio.Semaphore(max_concurrency)
+        
+        async def _one(resume_text: str) -> Dict:
+            async with sem:
+                return await self.extract_skills_with_rag(resume_text, skill_database)
+        
+        return await asyncio.gather(*(_one(r) for r in resumes), return_exceptions=True)
+    
     def _retrieve_relevant_skills(
         self, 
         resume_text: str, 
@@ -110,24 +162,18 @@ class RAGResumeParser:
             return []
         
         try:
-            # Create corpus: [resume_text, skill1_text, skill2_text, ...]
-            skill_texts = []
-            for skill in skill_database:
-                # Combine name, category, and description for better matching
-                skill_text = f"{skill['name']} {skill.get('category', '')} {skill.get('description', '')}"
-                skill_texts.append(skill_text)
-            
-            # Fit TF-IDF on all documents
-            corpus = [resume_text] + skill_texts
-            tfidf_matrix = self.vectorizer.fit_transform(corpus)
+            vectorizer, skill_vectors = self._get_skill_vectors(skill_database)
+            # Dense, C-contiguous float32 query so the CSR matvec runs on a flat buffer
+            resume_vector = np.ascontiguousarray(
+                vectorizer.transform([resume_text]).toarray().ravel(), dtype=np.float32
+            )
             
-            # Calculate cosine similarity between resume and each skill
-            resume_vector = tfidf_matrix[0:1]
-            skill_vectors = tfidf_matrix[1:]
-            similarities = cosine_similarity(resume_vector, skill_vectors)[0]
+            # TF-IDF rows are already L2-normalized, so cosine similarity
+            # between resume and each skill is one matrix-vector product
+            similarities = skill_vectors @ resume_vector
             
             # Get top-k most similar skills
-            top_indices = np.argsort(similarities)[-top_k:][::-1]
+            top_indices = _top_k_indices(similarities, top_k)
             
             relevant_skills = []
             for idx in top_indices:
@@ -141,19 +187,42 @@ class RAGResumeParser:
         except Exception:
             return skill_database[:30]  # Fallback to first 30
     
+    def _get_skill_vectors(self, skill_database: List[Dict]) -> Tuple[TfidfVectorizer, object]:
+        """
+        Return a vectorizer fitted on the skill database and the skills' TF-IDF matrix,
+        fitting only the first time a skill database is seen
+        """
+        # Combine name, category, and description for better matching
+        skill_texts = [
+            f"{skill['name']} {skill.get('category', '')} {skill.get('description', '')}"
+            for skill in skill_database
+        ]
+        key = hashlib.blake2b("\n".join(skill_texts).encode(), digest_size=16).hexdigest()
+        
+        cached = self._skill_cache.get(key)
+        if cached is None:
+            if len(self._skill_cache) >= _MAX_SKILL_CACHE:
+                self._skill_cache.pop(next(iter(self._skill_cache)))
+            vectorizer = clone(_VECTORIZER_TEMPLATE)
+            skill_vectors = vectorizer.fit_transform(skill_texts)
+            cached = (vectorizer, skill_vectors)
+            self._skill_cache[key] = cached
+        
+        return cached
+    
     def _fallback_extraction(self, resume_text: str, skill_database: List[Dict]) -> Dict:
         """Fallback to simple keyword matching if RAG fails"""
-        resume_lower = resume_text.lower()
-        matched_skills = []
-        
-        for skill in skill_database:
-            if skill['name'].lower() in resume_lower:
-                matched_skills.append({
-                    "name": skill['name'],
-                    "proficiency": "Intermediate",
-                    "confidence": 0.7,
-                    "evidence": "keyword match"
-                })
+        # Single Aho-Corasick pass over the resume covers the whole skill database
+        matched_indices = get_skill_matcher(skill_database).find(resume_text.lower())
+        matched_skills = [
+            {
+                "name": skill_database[i]['name'],
+                "proficiency": "Intermediate",
+                "confidence": 0.7,
+                "evidence": "keyword match"
+            }
+            for i in matched_indices
+        ]
         
         return {
             "matched_skills": matched_skills,
@@ -169,46 +238,37 @@ class RAGResumeParser:
 class NLPResumeParser:
     """Traditional NLP approach using keyword extraction and pattern matching"""
     
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(
-            max_features=100,
-            ngram_range=(1, 3),
-            stop_words='english'
-        )
-    
     def extract_skills_nlp(self, resume_text: str, skill_database: List[Dict]) -> Dict:
         """
         Extract skills using traditional NLP:
-        1. TF-IDF keyword extraction
+        1. Term-frequency keyword extraction
         2. Pattern matching
         3. Fuzzy string matching
         """
         
-        # Extract keywords
-        try:
-            tfidf_matrix = self.vectorizer.fit_transform([resume_text])
-            feature_names = self.vectorizer.get_feature_names_out()
-            scores = tfidf_matrix.toarray()[0]
-            
-            # Get top keywords
-            top_indices = np.argsort(scores)[-50:][::-1]
-            keywords = [feature_names[i] for i in top_indices if scores[i] > 0]
-            
-        except:
-            keywords = resume_text.lower().split()
+        resume_lower = resume_text.lower()
+        
+        # Top keywords by frequency; IDF is meaningless when fitting on a single resume
+        keyword_counts = Counter(
+            token for token in _TOKEN_RE.findall(resume_lower)
+            if len(token) > 2 and token not in ENGLISH_STOP_WORDS
+        )
+        keywords = [word for word, _ in keyword_counts.most_common(50)]
         
         # Match keywords with skill database
         matched_skills = []
-        resume_lower = resume_text.lower()
+        resume_words = resume_lower.split()
+        skill_matcher = get_skill_matcher(skill_database)
+        exact_indices = set(skill_matcher.find(resume_lower))
         
-        for skill in skill_database:
-            skill_name_lower = skill['name'].lower()
+        for index, skill in enumerate(skill_database):
+            skill_name_lower = skill_matcher.names_lower[index]
             
             # Exact match
-            if skill_name_lower in resume_lower:
+            if index in exact_indices:
                 matched_skills.append({
                     "name": skill['name'],
-                    "proficiency": self._estimate_proficiency(resume_text, skill_name_lower),
+                    "proficiency": self._estimate_proficiency(resume_words, skill_name_lower),
                     "match_type": "exact"
                 })
             # Keyword match
@@ -226,31 +286,21 @@ class NLPResumeParser:
             "method": "NLP"
         }
     
-    def _estimate_proficiency(self, text: str, skill: str) -> str:
-        """Estimate proficiency based on context keywords"""
-        text_lower = text.lower()
-        
-        expert_keywords = ['expert', 'senior', 'lead', 'architect', 'advanced']
-        intermediate_keywords = ['experience', 'proficient', 'worked with', 'developed']
-        beginner_keywords = ['learning', 'basic', 'familiar', 'introduced']
+    def _estimate_proficiency(self, words: List[str], skill: str) -> str:
+        """Estimate proficiency from context keywords around mentions of the skill in the lowercase resume words"""
         
-        # Count occurrences near the skill mention
-        skill_contexts = []
-        for i, word in enumerate(text_lower.split()):
-            if skill in word:
-                # Get 10 words before and after
-                start = max(0, i - 10)
-                end = min(len(text_lower.split()), i + 10)
-                context = ' '.join(text_lower.split()[start:end])
-                skill_contexts.append(context)
-        
-        combined_context = ' '.join(skill_contexts)
+        # Get 10 words before and after each skill mention
+        combined_context = ' '.join(
+            ' '.join(words[max(0, i - 10):i + 10])
+            for i, word in enumerate(words)
+            if skill in word
+        )
         
-        if any(kw in combined_context for kw in expert_keywords):
+        if _EXPERT_RE.search(combined_context):
             return "Expert"
-        elif any(kw in combined_context for kw in intermediate_keywords):
+        elif _INTERMEDIATE_RE.search(combined_context):
             return "Advanced"
-        elif any(kw in combined_context for kw in beginner_keywords):
+        elif _BEGINNER_RE.search(combined_context):
             return "Beginner"
         else:
             return "Intermediate"
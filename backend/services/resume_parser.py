@@ -3,6 +3,11 @@ import docx
 from typing import Dict, List
 import re
 
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_PHONE_RE = re.compile(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]')
+_WHITESPACE_RE = re.compile(r'\s+')
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s\.\,\-\(\)\@\+]')
+
 class ResumeParser:
     """Service to extract text and information from resume files"""
     
@@ -10,11 +15,8 @@ class ResumeParser:
     def extract_text_from_pdf(file_path: str) -> str:
         """Extract text from PDF file"""
         try:
-            text = ""
             reader = PdfReader(file_path)
-            for page in reader.pages:
-                text += page.extract_text()
-            return text
+            return "".join([page.extract_text() or "" for page in reader.pages])
         except Exception as e:
             raise Exception(f"Error extracting text from PDF: {str(e)}")
     
@@ -41,22 +43,20 @@ class ResumeParser:
     @staticmethod
     def extract_email(text: str) -> str:
         """Extract email from resume text"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        matches = re.findall(email_pattern, text)
-        return matches[0] if matches else ""
+        match = _EMAIL_RE.search(text)
+        return match.group(0) if match else ""
     
     @staticmethod
     def extract_phone(text: str) -> str:
         """Extract phone number from resume text"""
-        phone_pattern = r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]'
-        matches = re.findall(phone_pattern, text)
-        return matches[0] if matches else ""
+        match = _PHONE_RE.search(text)
+        return match.group(0) if match else ""
     
     @staticmethod
     def clean_text(text: str) -> str:
         """Clean extracted text"""
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s\.\,\-\(\)\@\+]', '', text)
+        text = _SPECIAL_CHARS_RE.sub('', text)
         return text.strip()
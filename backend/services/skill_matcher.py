@@ -0,0 +1,58 @@
+"""
+Skill Keyword Matcher
+Finds every skill name from the skill database inside a resume in a single Aho-Corasick pass
+"""
+
+from typing import Dict, List
+import ahocorasick
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over lowercase skill names"""
+
+    def __init__(self, skill_database: List[Dict]):
+        self.automaton = ahocorasick.Automaton()
+
+        # Lowercase skill names in database order, computed once per skill database
+        self.names_lower: List[str] = [skill['name'].lower() for skill in skill_database]
+
+        # Lowercase name -> indices of skills with that name (names may repeat across categories)
+        positions: Dict[str, List[int]] = {}
+        for index, name_lower in enumerate(self.names_lower):
+            if name_lower:
+                positions.setdefault(name_lower, []).append(index)
+
+        for name_lower, indices in positions.items():
+            self.automaton.add_word(name_lower, tuple(indices))
+
+        if positions:
+            self.automaton.make_automaton()
+
+    def find(self, text_lower: str) -> List[int]:
+        """Return indices of skills whose lowercase name occurs in the text, in database order"""
+        if self.automaton.kind != ahocorasick.AHOCORASICK:
+            return []
+
+        matched = set()
+        for _, indices in self.automaton.iter(text_lower):
+            matched.update(indices)
+        return sorted(matched)
+
+
+# Matchers for recently seen skill databases, keyed by their skill names
+_matchers: Dict[tuple, SkillMatcher] = {}
+_MAX_MATCHERS = 8
+
+
+def get_skill_matcher(skill_database: List[Dict]) -> SkillMatcher:
+    """Return a cached matcher for this skill database, building it on first use"""
+    key = tuple(skill['name'] for skill in skill_database)
+    matcher = _matchers.get(key)
+
+    if matcher is None:
+        if len(_matchers) >= _MAX_MATCHERS:
+            _matchers.pop(next(iter(_matchers)))
+        matcher = SkillMatcher(skill_database)
+        _matchers[key] = matcher
+
+    return matcher
@@ -3,8 +3,10 @@ YouTube Video Validation Service
 Validates YouTube video availability and accessibility
 """
 import re
-import httpx
-from typing import Tuple
+import asyncio
+from typing import List, Tuple
+from cachetools import TTLCache
+from services.http_client import youtube_http_client
 
 class YouTubeValidator:
     """Validates YouTube video URLs and availability"""
@@ -13,23 +15,18 @@ class YouTubeValidator:
     YOUTUBE_SHORTS_PATTERN = r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/shorts\/([a-zA-Z0-9_-]{11})'
     YOUTU_BE_PATTERN = r'(?:https?:\/\/)?youtu\.be\/([a-zA-Z0-9_-]{11})'
     
+    # All URL formats in one compiled alternation; only the matching format's group captures the ID
+    VIDEO_ID_RE = re.compile('|'.join((YOUTUBE_URL_PATTERN, YOUTUBE_SHORTS_PATTERN, YOUTU_BE_PATTERN)))
+    
+    # Video ID -> availability; popular videos recur across many users' roadmaps
+    _availability_cache = TTLCache(maxsize=10_000, ttl=86400)
+    
     @staticmethod
     def extract_video_id(url: str) -> str | None:
-        """Extract video ID from YouTube URL"""
-        # Try standard youtube.com format
-        match = re.search(YouTubeValidator.YOUTUBE_URL_PATTERN, url)
-        if match:
-            return match.group(1)
-        
-        # Try shorts format
-        match = re.search(YouTubeValidator.YOUTUBE_SHORTS_PATTERN, url)
+        """Extract video ID from a youtube.com watch, shorts or youtu.be URL"""
+        match = YouTubeValidator.VIDEO_ID_RE.search(url)
         if match:
-            return match.group(1)
-        
-        # Try youtu.be format
-        match = re.search(YouTubeValidator.YOUTU_BE_PATTERN, url)
-        if match:
-            return match.group(1)
+            return match.group(match.lastindex)
         
         return None
     
@@ -44,17 +41,22 @@ class YouTubeValidator:
             if not video_id:
                 return False, ""
             
+            cached = YouTubeValidator._availability_cache.get(video_id)
+            if cached is not None:
+                return cached, video_id
+            
             # Try to fetch video info using noembed API (doesn't require API key)
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(
-                    f"https://noembed.com/embed?url=https://www.youtube.com/watch?v={video_id}"
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    # Check if it's a valid video response
-                    if "error" not in data and "title" in data:
-                        return True, video_id
+            response = await youtube_http_client.get(
+                f"https://noembed.com/embed?url=https://www.youtube.com/watch?v={video_id}"
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                # Check if it's a valid video response; only definitive answers are cached
+                is_available = "error" not in data and "title" in data
+                YouTubeValidator._availability_cache[video_id] = is_available
+                if is_available:
+                    return True, video_id
         
         except Exception as e:
             print(f"Error validating YouTube video {url}: {str(e)}")
@@ -63,6 +65,20 @@ class YouTubeValidator:
         
         return False, video_id or ""
     
+    @staticmethod
+    async def validate_many(urls: List[str], max_concurrency: int = 10) -> List:
+        """
+        Check availability of many URLs concurrently, at most max_concurrency probes at a time
+        Returns (is_available, video_id) per URL in input order, or the exception if a check failed
+        """
+        sem = asyncio.Semaphore(max_concurrency)
+        
+        async def _one(url: str) -> Tuple[bool, str]:
+            async with sem:
+                return await YouTubeValidator.is_video_available(url)
+        
+        return await asyncio.gather(*(_one(url) for url in urls), return_exceptions=True)
+    
     @staticmethod
     async def validate_and_fix_url(url: str) -> str:
         """
@@ -2,15 +2,26 @@
 Test configuration and fixtures
 """
 import pytest
-import asyncio
-from typing import Generator
+import httpx
+import respx
 
-@pytest.fixture(scope="session")
-def event_loop() -> Generator:
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+GROQ_CHAT_URL = "https://api.groq.com/openai/v1/chat/completions"
+
+def groq_completion(content: str) -> httpx.Response:
+    """Build a Groq chat completion HTTP response carrying the given message content"""
+    return httpx.Response(200, json={
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "llama-3.3-70b-versatile",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}]
+    })
+
+@pytest.fixture
+def groq_api():
+    """Stub the Groq chat completions endpoint at the HTTP layer"""
+    with respx.mock(assert_all_called=False) as router:
+        yield router.post(GROQ_CHAT_URL)
 
 @pytest.fixture
 def test_user_data():
@@ -0,0 +1,124 @@
+"""
+Tests for the chatbot API
+"""
+import pytest
+import httpx
+import orjson
+from httpx import AsyncClient
+from unittest.mock import AsyncMock, patch
+from main import app
+from services.chatbot_service import chatbot_service
+from tests.conftest import groq_completion
+
+AUTH_HEADERS = {"Authorization": "Bearer test-token"}
+
+def groq_stream(*events: dict) -> httpx.Response:
+    """Build a Groq server-sent event stream from the given event payloads"""
+    body = b"".join(b"data: " + orjson.dumps(event) + b"\n\n" for event in events) + b"data: [DONE]\n\n"
+    return httpx.Response(200, content=body, headers={"content-type": "text/event-stream"})
+
+def delta(content: str) -> dict:
+    """A streamed chat completion chunk carrying one piece of response text"""
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": "llama-3.3-70b-versatile",
+        "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}]
+    }
+
+@pytest.fixture(autouse=True)
+def authenticated_user():
+    """Accept any bearer token as a fixed test user and start with an empty response cache"""
+    chatbot_service._response_cache.clear()
+    with patch("api.routes.chatbot.verify_token", new=AsyncMock(return_value={"user_id": "test_user_id"})):
+        yield
+
+def chat_request(question: str) -> dict:
+    return {"messages": [{"role": "user", "content": question}], "include_context": False}
+
+@pytest.mark.asyncio
+async def test_chat_stream_relays_response(groq_api):
+    """Test streamed response text is relayed to the client as it arrives"""
+    groq_api.mock(return_value=groq_stream(delta("Hello"), delta(" there")))
+    
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post("/api/chatbot/chat/stream", json=chat_request("Say hi"), headers=AUTH_HEADERS)
+    
+    assert response.status_code == 200
+    assert response.text == "Hello there"
+
+@pytest.mark.asyncio
+async def test_chat_stream_failed_request_returns_error_status(groq_api):
+    """Test a failed Groq request returns the same 500 as the non-streaming route, not an empty 200"""
+    groq_api.mock(return_value=httpx.Response(400, json={"error": {"message": "Groq unavailable"}}))
+    
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        streamed = await client.post("/api/chatbot/chat/stream", json=chat_request("Say hi"), headers=AUTH_HEADERS)
+        plain = await client.post("/api/chatbot/chat", json=chat_request("Say hi"), headers=AUTH_HEADERS)
+    
+    assert streamed.status_code == 500
+    assert streamed.json()["message"] == "Chatbot service error occurred"
+    assert streamed.json() == plain.json()
+
+@pytest.mark.asyncio
+async def test_chat_stream_reports_interruption(groq_api):
+    """Test an error after streaming starts ends the body with a notice"""
+    groq_api.mock(return_value=groq_stream(delta("Hello"), {"error": {"message": "stream reset"}}))
+    
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post("/api/chatbot/chat/stream", json=chat_request("Say hi"), headers=AUTH_HEADERS)
+    
+    assert response.status_code == 200
+    assert response.text.startswith("Hello")
+    assert response.text.endswith("The response was interrupted. Please try again.")
+
+@pytest.mark.asyncio
+async def test_chat_caches_answers_for_users_with_same_context(groq_api):
+    """Test a repeated question from users with the same rendered context is answered from the cache"""
+    groq_api.mock(return_value=groq_completion("Open the dashboard to see your progress."))
+    new_user_context = AsyncMock(return_value={"skills": [], "progress": 0})
+    
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        with patch("api.routes.chatbot._get_user_context", new=new_user_context):
+            first = await client.post("/api/chatbot/chat", json={"messages": [{"role": "user", "content": "Where is my dashboard?"}]}, headers=AUTH_HEADERS)
+            second = await client.post("/api/chatbot/chat", json={"messages": [{"role": "user", "content": "  where is my   DASHBOARD? "}]}, headers=AUTH_HEADERS)
+    
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert groq_api.call_count == 1
+
+@pytest.mark.asyncio
+async def test_chat_cache_separates_user_contexts(groq_api):
+    """Test users with different skills do not share cached answers"""
+    groq_api.mock(return_value=groq_completion("Try building a REST API next."))
+    request = {"messages": [{"role": "user", "content": "What should I build next?"}]}
+    
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        with patch("api.routes.chatbot._get_user_context", new=AsyncMock(return_value={"skills": ["Python"], "progress": 0})):
+            await client.post("/api/chatbot/chat", json=request, headers=AUTH_HEADERS)
+        with patch("api.routes.chatbot._get_user_context", new=AsyncMock(return_value={"skills": ["React"], "progress": 0})):
+            await client.post("/api/chatbot/chat", json=request, headers=AUTH_HEADERS)
+    
+    assert groq_api.call_count == 2
+    contexts = [orjson.loads(call.request.content)["messages"][1]["content"] for call in groq_api.calls]
+    assert "Python" in contexts[0] and "React" in contexts[1]
+
+@pytest.mark.asyncio
+async def test_chat_stream_closes_response_when_consumer_exits_early(groq_api):
+    """Test a client that disconnects mid-stream releases the Groq connection"""
+    groq_api.mock(return_value=groq_stream(delta("Hello"), delta(" there")))
+    completions = chatbot_service.client.chat.completions
+    create = completions.create
+    streams = []
+    
+    async def create_and_record(**kwargs):
+        streams.append(await create(**kwargs))
+        return streams[-1]
+    
+    with patch.object(completions, "create", new=create_and_record):
+        chunks = await chatbot_service.chat_stream([{"role": "user", "content": "Say hi"}])
+        assert await chunks.__anext__() == "Hello"
+        await chunks.aclose()
+    
+    assert streams[0].response.is_closed
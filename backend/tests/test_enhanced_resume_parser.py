@@ -0,0 +1,79 @@
+"""
+Unit tests for Enhanced Resume Parser
+"""
+import pytest
+import asyncio
+import httpx
+from unittest.mock import Mock
+from services.enhanced_resume_parser import EnhancedResumeParser
+from tests.conftest import groq_completion
+
+SKILL_DATABASE = [{"_id": "1", "name": "Python"}, {"_id": "2", "name": "React"}]
+RESUME_TEXT = "Software engineer with 3 years of Python and React experience"
+
+@pytest.fixture
+def parser():
+    return EnhancedResumeParser()
+
+@pytest.mark.asyncio
+async def test_extract_skills_caches_llm_result(parser, groq_api):
+    """Test a repeated resume is served from the cache with fresh timing metadata"""
+    groq_api.mock(return_value=groq_completion('{"skills": ["Python", "React"], "experience_years": 3, "education": "", "job_titles": []}'))
+    
+    first = await parser.extract_skills(RESUME_TEXT, SKILL_DATABASE, method="llm")
+    first["matched_skills"].clear()
+    second = await parser.extract_skills(RESUME_TEXT, SKILL_DATABASE, method="llm")
+    
+    assert groq_api.call_count == 1
+    assert [s["name"] for s in second["matched_skills"]] == ["Python", "React"]
+    assert second["processing_time"] != first["processing_time"]
+
+@pytest.mark.asyncio
+async def test_extract_skills_does_not_cache_llm_failure(parser, groq_api):
+    """Test an extraction during a Groq outage is retried once Groq recovers"""
+    groq_api.mock(return_value=httpx.Response(400, json={"error": {"message": "Groq unavailable"}}))
+    
+    failed = await parser.extract_skills(RESUME_TEXT, SKILL_DATABASE, method="llm")
+    assert failed["matched_skills"] == []
+    
+    groq_api.mock(return_value=groq_completion('{"skills": ["Python"], "experience_years": 3, "education": "", "job_titles": []}'))
+    
+    recovered = await parser.extract_skills(RESUME_TEXT, SKILL_DATABASE, method="llm")
+    
+    assert groq_api.call_count == 2
+    assert [s["name"] for s in recovered["matched_skills"]] == ["Python"]
+
+@pytest.mark.asyncio
+async def test_coalesced_extraction_is_per_skill_database(parser):
+    """Test concurrent callers share one extraction only for the same skill database, each with its own copy"""
+    calls = []
+    
+    async def extract(resume_text, skill_database):
+        calls.append(skill_database)
+        await asyncio.sleep(0)
+        return {"matched_skills": [{"name": skill_database[0]["name"]}], "method": "LangChain_RAG"}
+    
+    parser.langchain_parser = Mock(extract_skills_with_langchain=extract)
+    other_database = [{"_id": "3", "name": "Go"}]
+    
+    same_a, same_b, other = await asyncio.gather(
+        parser._coalesced_langchain_extract(RESUME_TEXT, SKILL_DATABASE),
+        parser._coalesced_langchain_extract(RESUME_TEXT, SKILL_DATABASE),
+        parser._coalesced_langchain_extract(RESUME_TEXT, other_database)
+    )
+    
+    assert calls == [SKILL_DATABASE, other_database]
+    assert same_a == same_b
+    assert same_a["matched_skills"] is not same_b["matched_skills"]
+    assert other["matched_skills"] == [{"name": "Go"}]
+
+@pytest.mark.asyncio
+async def test_extract_skills_cache_misses_after_skill_edit(parser, groq_api):
+    """Test editing a skill's description, not just its name, invalidates cached extractions"""
+    groq_api.mock(return_value=groq_completion('{"skills": ["Python"], "experience_years": 3, "education": "", "job_titles": []}'))
+    edited_database = [dict(SKILL_DATABASE[0], description="General-purpose programming language"), SKILL_DATABASE[1]]
+    
+    await parser.extract_skills(RESUME_TEXT, SKILL_DATABASE, method="llm")
+    await parser.extract_skills(RESUME_TEXT, edited_database, method="llm")
+    
+    assert groq_api.call_count == 2
@@ -0,0 +1,40 @@
+"""
+Unit tests for the Aho-Corasick skill matcher
+"""
+from services.skill_matcher import SkillMatcher, get_skill_matcher
+
+def test_find_reports_overlapping_names():
+    """Test names contained in other names are all found, like a substring check per skill"""
+    skill_database = [{"name": "JavaScript"}, {"name": "Java"}, {"name": "Script"}, {"name": "Rust"}]
+    
+    matcher = SkillMatcher(skill_database)
+    
+    assert matcher.find("built apps in javascript") == [0, 1, 2]
+
+def test_find_returns_every_duplicate_name_in_database_order():
+    """Test a name repeated across categories maps to every matching skill, sorted by position"""
+    skill_database = [
+        {"name": "Docker", "category": "DevOps"},
+        {"name": "Python", "category": "Languages"},
+        {"name": "python", "category": "Data Science"},
+    ]
+    
+    matcher = SkillMatcher(skill_database)
+    
+    assert matcher.find("python and docker, mostly python") == [0, 1, 2]
+    assert matcher.names_lower == ["docker", "python", "python"]
+
+def test_find_with_empty_database_or_no_match():
+    """Test an empty skill database or unrelated text yields no matches"""
+    assert SkillMatcher([]).find("python developer") == []
+    assert SkillMatcher([{"name": ""}]).find("python developer") == []
+    assert SkillMatcher([{"name": "Go"}]).find("python developer") == []
+
+def test_get_skill_matcher_reuses_matcher_for_same_database():
+    """Test the matcher is built once per skill database and rebuilt when it changes"""
+    skill_database = [{"name": "React"}, {"name": "Vue"}]
+    
+    matcher = get_skill_matcher(skill_database)
+    
+    assert get_skill_matcher([dict(skill) for skill in skill_database]) is matcher
+    assert get_skill_matcher(skill_database + [{"name": "Svelte"}]) is not matcher
@@ -0,0 +1,92 @@
+"""
+Unit tests for YouTube Validator
+"""
+import pytest
+import asyncio
+import httpx
+import respx
+from unittest.mock import patch
+from services.youtube_validator import YouTubeValidator
+
+NOEMBED_URL = "https://noembed.com/embed"
+
+@pytest.fixture(autouse=True)
+def empty_availability_cache():
+    """Start and end every test with an empty availability cache"""
+    YouTubeValidator._availability_cache.clear()
+    yield
+    YouTubeValidator._availability_cache.clear()
+
+@pytest.fixture
+def noembed_api():
+    """Stub the noembed endpoint at the HTTP layer"""
+    with respx.mock(assert_all_called=False) as router:
+        yield router.get(NOEMBED_URL)
+
+@pytest.mark.asyncio
+async def test_is_video_available_caches_by_video_id(noembed_api):
+    """Test the same video behind different URL formats is looked up only once"""
+    noembed_api.mock(return_value=httpx.Response(200, json={"title": "Python Full Course"}))
+    
+    first = await YouTubeValidator.is_video_available("https://www.youtube.com/watch?v=rfscVS0vtbw")
+    second = await YouTubeValidator.is_video_available("https://youtu.be/rfscVS0vtbw")
+    
+    assert first == second == (True, "rfscVS0vtbw")
+    assert noembed_api.call_count == 1
+
+@pytest.mark.asyncio
+async def test_is_video_available_caches_unavailable_verdict(noembed_api):
+    """Test a definitive 'video not found' answer is cached too"""
+    noembed_api.mock(return_value=httpx.Response(200, json={"error": "404 Not Found"}))
+    
+    assert await YouTubeValidator.is_video_available("https://youtu.be/ABCDEFGHIJ_") == (False, "ABCDEFGHIJ_")
+    assert await YouTubeValidator.is_video_available("https://youtu.be/ABCDEFGHIJ_") == (False, "ABCDEFGHIJ_")
+    assert noembed_api.call_count == 1
+
+@pytest.mark.asyncio
+async def test_is_video_available_does_not_cache_non_200(noembed_api):
+    """Test a transient upstream error is retried on the next lookup"""
+    noembed_api.side_effect = [
+        httpx.Response(503),
+        httpx.Response(200, json={"title": "Python Full Course"}),
+    ]
+    
+    assert await YouTubeValidator.is_video_available("https://youtu.be/rfscVS0vtbw") == (False, "rfscVS0vtbw")
+    assert await YouTubeValidator.is_video_available("https://youtu.be/rfscVS0vtbw") == (True, "rfscVS0vtbw")
+    assert noembed_api.call_count == 2
+
+@pytest.mark.asyncio
+async def test_validate_many_keeps_order_and_limits_concurrency():
+    """Test results come back in input order with at most max_concurrency probes in flight"""
+    in_flight = 0
+    peak = 0
+    
+    async def probe(url):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return url.endswith("ok"), url
+    
+    urls = [f"https://youtu.be/video{i}-{'ok' if i % 2 else 'gone'}" for i in range(6)]
+    
+    with patch.object(YouTubeValidator, "is_video_available", side_effect=probe):
+        results = await YouTubeValidator.validate_many(urls, max_concurrency=2)
+    
+    assert results == [(url.endswith("ok"), url) for url in urls]
+    assert peak == 2
+
+@pytest.mark.asyncio
+async def test_validate_many_returns_exceptions_in_place():
+    """Test one failed check doesn't fail the whole batch"""
+    async def probe(url):
+        if "bad" in url:
+            raise RuntimeError("probe failed")
+        return True, url
+    
+    with patch.object(YouTubeValidator, "is_video_available", side_effect=probe):
+        results = await YouTubeValidator.validate_many(["https://youtu.be/good", "https://youtu.be/bad"])
+    
+    assert results[0] == (True, "https://youtu.be/good")
+    assert isinstance(results[1], RuntimeError)